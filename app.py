@@ -0,0 +1,73 @@
+"""Single entry point for all apps as one multipage Streamlit app.
+
+    streamlit run app.py
+
+Each page's script runs only when that page is opened, so its dependencies
+(scikit-learn, pandas, PIL, ...) are imported on first use instead of at
+startup. Shared resources come from app_resources and are created once per
+process. The first time a page is opened in a process, the launcher imports
+the script's top-level modules itself so that import time can be reported
+separately from render time.
+"""
+import ast
+import importlib
+import runpy
+import sys
+import time
+
+import streamlit as st
+
+from app_resources import get_page_timings
+
+PAGES = [
+    ("task1.py", "Snake", "🐍", "snake"),
+    ("task2.py", "House Prices", "🏠", "house_prices"),
+    ("task3.py", "Chess", "♟️", "chess"),
+    ("task4.py", "Instagram", "📸", "instagram"),
+    ("sessions_page.py", "Session Memory", "🧠", "sessions"),
+]
+
+def top_level_imports(script):
+    """Absolute module names imported at the top level of a script"""
+    with open(script, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=script)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules.append(node.module)
+    return modules
+
+def import_page_modules(script):
+    """Import a page's modules, timing each one. Returns (seconds, modules added, per-module seconds)."""
+    modules_before = len(sys.modules)
+    by_module = {}
+    start = time.perf_counter()
+    for name in top_level_imports(script):
+        module_start = time.perf_counter()
+        importlib.import_module(name)
+        by_module[name] = time.perf_counter() - module_start
+    return time.perf_counter() - start, len(sys.modules) - modules_before, by_module
+
+def make_page(script, title, icon, url_path):
+    def run_page():
+        timings = get_page_timings()
+        if not timings.imported(script):
+            timings.record_imports(script, *import_page_modules(script))
+        start = time.perf_counter()
+        try:
+            runpy.run_path(script, run_name="__main__")
+        finally:
+            # Also record runs that end in st.stop() or st.rerun()
+            timings.record_render(script, time.perf_counter() - start)
+
+    return st.Page(run_page, title=title, icon=icon, url_path=url_path)
+
+page = st.navigation([make_page(*entry) for entry in PAGES])
+
+# Shown before the page runs, since pages may end the run with st.stop()
+with st.sidebar.expander("Page timings"):
+    st.dataframe(get_page_timings().rows(), hide_index=True)
+
+page.run()
@@ -0,0 +1,106 @@
+"""Process-wide resources shared by every page of the launcher.
+
+Each getter is an st.cache_resource, so one instance is shared across pages
+and sessions. Dependencies are imported inside the getters, so a page only
+pays for the resources it actually uses.
+"""
+import threading
+
+import streamlit as st
+
+@st.cache_resource
+def get_model_registry():
+    """One model registry per process, shared by all sessions"""
+    from house_price_model import ModelRegistry
+
+    registry = ModelRegistry()
+    registry.refresh()
+    return registry
+
+@st.cache_resource
+def get_prediction_cache():
+    """One prediction cache per process, shared by all sessions"""
+    from house_price_cache import PredictionCache
+
+    return PredictionCache()
+
+@st.cache_resource
+def get_monitor():
+    """One latency/drift monitor per process, compared against the training data.
+
+    The reference is built from the dataset cache only once drift is needed,
+    and never downloads the dataset.
+    """
+    from functools import partial
+    from house_price_metrics import Monitor, training_reference
+
+    return Monitor(reference_loader=partial(training_reference, build_cache=False))
+
+@st.cache_resource
+def get_tile_pyramid(model_version):
+    """Price tiles for a model version, built on first use"""
+    from house_price_tiles import get_pyramid
+
+    model, version = get_model_registry().get()
+    return get_pyramid(model, version)
+
+@st.cache_resource
+def get_arena(grid_size, bots):
+    """One snake arena per process, shared by every session"""
+    from snake_arena import Arena
+
+    arena = Arena(grid_size)
+    arena.add_bots(bots)
+    arena.start()
+    return arena
+
+@st.cache_resource
+def get_session_registry():
+    """One session-state registry per process; idle sessions are compacted and evicted in the background"""
+    from session_memory import SessionRegistry
+
+    registry = SessionRegistry()
+    registry.start()
+    return registry
+
+class PageTimings:
+    """Import and render timings per launcher page"""
+
+    def __init__(self):
+        self.pages = {}
+        self._lock = threading.Lock()
+
+    def record_imports(self, page, seconds, modules_added, by_module):
+        with self._lock:
+            entry = self.pages.setdefault(page, {'renders': 0})
+            entry.update({'import_ms': seconds * 1000, 'modules_added': modules_added,
+                          'slowest_imports': sorted(by_module.items(), key=lambda item: item[1], reverse=True)[:3]})
+
+    def record_render(self, page, seconds):
+        with self._lock:
+            entry = self.pages.setdefault(page, {'renders': 0})
+            entry.setdefault('first_render_ms', seconds * 1000)
+            entry['last_render_ms'] = seconds * 1000
+            entry['renders'] += 1
+
+    def imported(self, page):
+        with self._lock:
+            return 'import_ms' in self.pages.get(page, {})
+
+    def rows(self):
+        with self._lock:
+            return [{
+                'page': page,
+                'import_ms': round(entry.get('import_ms', 0.0), 1),
+                'modules_added': entry.get('modules_added', 0),
+                'first_render_ms': round(entry.get('first_render_ms', 0.0), 1),
+                'last_render_ms': round(entry.get('last_render_ms', 0.0), 1),
+                'renders': entry['renders'],
+                'slowest_imports': ", ".join(f"{name} {seconds * 1000:.0f}ms"
+                                             for name, seconds in entry.get('slowest_imports', []))
+            } for page, entry in self.pages.items()]
+
+@st.cache_resource
+def get_page_timings():
+    """Timings collected by the launcher for this process"""
+    return PageTimings()
@@ -0,0 +1,105 @@
+import gzip
+import os
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from house_price_model import FEATURE_NAMES
+
+DEFAULT_CHUNK_ROWS = 100_000
+DEFAULT_PART_ROWS = 1_000_000
+
+PREDICTION_COLUMN = 'PredictedMedHouseVal'
+STATUS_COLUMN = 'PredictionStatus'
+
+def coerce_features(chunk: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert a chunk to a float feature matrix and a mask of usable rows"""
+    missing = [name for name in FEATURE_NAMES if name not in chunk.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    features = np.empty((len(chunk), len(FEATURE_NAMES)), dtype=np.float64)
+    for i, name in enumerate(FEATURE_NAMES):
+        features[:, i] = pd.to_numeric(chunk[name], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    valid = np.isfinite(features).all(axis=1)
+    return features, valid
+
+def row_status(features: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """'ok' for priced rows, otherwise which features were missing or invalid"""
+    status = np.full(len(features), 'ok', dtype=object)
+    names = np.array(FEATURE_NAMES)
+    invalid = ~np.isfinite(features)
+    for i in np.flatnonzero(~valid):
+        status[i] = 'invalid: ' + ', '.join(names[invalid[i]])
+    return status
+
+def iter_chunks(source, file_name: str, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[Tuple[pd.DataFrame, Optional[float]]]:
+    """Read a CSV or Parquet file in chunks, yielding (chunk, progress) pairs"""
+    if file_name.lower().endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(source)
+        total_rows = parquet_file.metadata.num_rows
+        rows_done = 0
+        for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+            rows_done += batch.num_rows
+            yield batch.to_pandas(), rows_done / total_rows if total_rows else None
+    else:
+        # The row count of a CSV is unknown upfront, so report progress by bytes read
+        total_bytes = getattr(source, 'size', None)
+        # Read every column as text, so columns other than the features are written back unchanged
+        for chunk in pd.read_csv(source, chunksize=chunk_rows, dtype=str, keep_default_na=False):
+            progress = source.tell() / total_bytes if total_bytes else None
+            yield chunk, progress
+
+def predict_file(model, source, file_name: str, output_dir: str,
+                 chunk_rows: int = DEFAULT_CHUNK_ROWS, part_rows: int = DEFAULT_PART_ROWS,
+                 on_progress: Optional[Callable[[int, Optional[float]], None]] = None,
+                 on_predict: Optional[Callable[[np.ndarray], None]] = None) -> Tuple[int, int, List[str]]:
+    """Predict every row of a feature file into gzipped CSV parts in output_dir.
+
+    Only one chunk is held in memory at a time, and each part holds at most
+    part_rows rows, so it can be downloaded on its own. Every input column is
+    written unchanged, followed by the prediction and a status column. Rows
+    with missing or non-numeric features get an empty prediction and a
+    status naming those features. on_predict receives the feature rows
+    priced in each chunk. Returns the rows read, the rows predicted and the
+    part paths.
+    """
+    rows_read = rows_predicted = 0
+    paths = []
+    out = None
+    rows_in_part = 0
+    try:
+        for chunk, progress in iter_chunks(source, file_name, chunk_rows):
+            features, valid = coerce_features(chunk)
+            predictions = np.full(len(chunk), np.nan)
+            if valid.any():
+                predictions[valid] = model.predict(features[valid])
+                if on_predict:
+                    on_predict(features[valid])
+            chunk[PREDICTION_COLUMN] = predictions
+            chunk[STATUS_COLUMN] = row_status(features, valid)
+
+            start = 0
+            while start < len(chunk):
+                if out is None or rows_in_part >= part_rows:
+                    if out is not None:
+                        out.close()
+                    paths.append(os.path.join(output_dir, f"house_price_predictions_{len(paths) + 1}.csv.gz"))
+                    out = gzip.open(paths[-1], 'wt', newline='')
+                    rows_in_part = 0
+                rows = chunk.iloc[start:start + part_rows - rows_in_part]
+                rows.to_csv(out, header=rows_in_part == 0, index=False)
+                rows_in_part += len(rows)
+                start += len(rows)
+
+            rows_read += len(chunk)
+            rows_predicted += int(valid.sum())
+            if on_progress:
+                on_progress(rows_read, progress)
+    finally:
+        if out is not None:
+            out.close()
+    return rows_read, rows_predicted, paths
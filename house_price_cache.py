@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from house_price_model import DEFAULT_FEATURES, FEATURE_DECIMALS, FEATURE_NAMES, FEATURE_RANGES
+
+_SCALE = 10.0 ** np.array(FEATURE_DECIMALS)
+
+def quantize(rows) -> np.ndarray:
+    """Round feature rows to the input precision, as integer keys"""
+    return np.rint(np.asarray(rows, dtype=np.float64) * _SCALE).astype(np.int64)
+
+def is_quantized(row) -> bool:
+    """Whether a row is already at the input precision, so its cache key stands for it exactly"""
+    row = np.asarray(row, dtype=np.float64)
+    return bool(np.array_equal(np.rint(row * _SCALE) / _SCALE, row))
+
+def common_input_grid(steps: int = 101) -> np.ndarray:
+    """The default input plus one-at-a-time sweeps of each feature over its range"""
+    rows = [DEFAULT_FEATURES]
+    for i, name in enumerate(FEATURE_NAMES):
+        low, high = FEATURE_RANGES[name]
+        sweep = np.tile(np.array(DEFAULT_FEATURES, dtype=np.float64), (steps, 1))
+        sweep[:, i] = np.linspace(low, high, steps)
+        rows.extend(sweep)
+    return np.array(rows)
+
+class PredictionCache:
+    """Bounded LRU/TTL cache of predictions keyed by quantized feature vector.
+
+    Entries belong to one model version; the whole cache is dropped as soon
+    as a prediction is requested for a different version.
+    """
+
+    def __init__(self, max_size: int = 100_000, ttl_seconds: Optional[float] = 3600.0):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.model_version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def _check_version(self, version: str):
+        if version != self.model_version:
+            self.entries.clear()
+            self.model_version = version
+
+    def _lookup(self, key: bytes, now: float) -> Optional[float]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, stored_at = entry
+        if self.ttl_seconds is not None and now - stored_at > self.ttl_seconds:
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    def _store(self, key: bytes, value: float, now: float):
+        self.entries[key] = (value, now)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, version: str, row) -> Optional[float]:
+        """Cached prediction for a single row, if any"""
+        key = quantize([row])[0].tobytes()
+        with self._lock:
+            self._check_version(version)
+            value = self._lookup(key, time.monotonic())
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, version: str, row, value: float):
+        """Store the prediction for a single row"""
+        key = quantize([row])[0].tobytes()
+        with self._lock:
+            self._check_version(version)
+            self._store(key, float(value), time.monotonic())
+
+    def predict(self, model, version: str, rows) -> np.ndarray:
+        """Predict rows, calling the model once for all cache misses"""
+        keys = quantize(rows)
+        results = np.empty(len(keys))
+        with self._lock:
+            self._check_version(version)
+            now = time.monotonic()
+            missing = []
+            for i, key in enumerate(keys):
+                value = self._lookup(key.tobytes(), now)
+                if value is None:
+                    missing.append(i)
+                else:
+                    results[i] = value
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            # Predict on the quantized inputs so a key always maps to one value
+            features = keys[missing] / _SCALE
+            predictions = model.predict(features)
+            results[missing] = predictions
+            with self._lock:
+                if version == self.model_version:
+                    now = time.monotonic()
+                    for i, value in zip(missing, predictions.tolist()):
+                        self._store(keys[i].tobytes(), value, now)
+        return results
+
+    def precompute(self, model, version: str, rows=None) -> int:
+        """Fill the cache for a grid of inputs in one predict call"""
+        rows = common_input_grid() if rows is None else np.asarray(rows, dtype=np.float64)
+        keys = quantize(rows)
+        predictions = model.predict(keys / _SCALE)
+        with self._lock:
+            self._check_version(version)
+            now = time.monotonic()
+            for key, value in zip(keys, predictions.tolist()):
+                self._store(key.tobytes(), value, now)
+        return len(keys)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'model_version': self.model_version
+        }
@@ -0,0 +1,135 @@
+"""Local, offline copy of the California housing dataset.
+
+The dataset is converted once into float64 .npy files plus a manifest with
+their SHA-256 checksums. Training memory-maps the arrays instead of
+fetching and rebuilding a pandas frame, so it works without network
+access once the cache exists.
+
+The cache can be built from, in order of preference:
+- a local CSV/Parquet copy with the feature columns and MedHouseVal
+  (the source argument or the HOUSE_PRICE_DATASET environment variable)
+- scikit-learn's download cache (no network needed if it is already seeded)
+- a fresh download through fetch_california_housing
+
+Example:
+    python house_price_data.py --source /mnt/bundle/california_housing.parquet
+"""
+import argparse
+import hashlib
+import json
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+
+from house_price_model import FEATURE_NAMES
+
+DATA_DIR = os.environ.get('HOUSE_PRICE_DATA_DIR', os.path.join('data', 'california_housing'))
+TARGET_NAME = 'MedHouseVal'
+
+FEATURES_FILE = 'features.npy'
+TARGET_FILE = 'target.npy'
+MANIFEST_FILE = 'manifest.json'
+
+_verified_dirs = set()
+
+def file_checksum(path: str) -> str:
+    """SHA-256 of a file, read in blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def read_source(source: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Read the raw dataset as (features, target) arrays"""
+    source = source or os.environ.get('HOUSE_PRICE_DATASET')
+    if source:
+        import pandas as pd
+
+        df = pd.read_parquet(source) if source.lower().endswith('.parquet') else pd.read_csv(source)
+        missing = [name for name in FEATURE_NAMES + [TARGET_NAME] if name not in df.columns]
+        if missing:
+            raise ValueError(f"{source} is missing columns: {', '.join(missing)}")
+        return df[FEATURE_NAMES].to_numpy(dtype=np.float64), df[TARGET_NAME].to_numpy(dtype=np.float64)
+
+    from sklearn.datasets import fetch_california_housing
+
+    data = fetch_california_housing()
+    if list(data.feature_names) != FEATURE_NAMES:
+        raise ValueError(f"Unexpected feature columns: {data.feature_names}")
+    return data.data.astype(np.float64), data.target.astype(np.float64)
+
+def build_dataset_cache(source: Optional[str] = None, data_dir: str = DATA_DIR) -> dict:
+    """Convert the dataset to .npy files and write their manifest"""
+    X, y = read_source(source)
+    os.makedirs(data_dir, exist_ok=True)
+
+    manifest = {'feature_names': FEATURE_NAMES, 'rows': int(len(y)), 'files': {}}
+    for file_name, array in [(FEATURES_FILE, np.ascontiguousarray(X)), (TARGET_FILE, y)]:
+        path = os.path.join(data_dir, file_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+        manifest['files'][file_name] = file_checksum(path)
+
+    # The manifest is written last, so its presence means the cache is complete
+    manifest_path = os.path.join(data_dir, MANIFEST_FILE)
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    _verified_dirs.add(data_dir)
+    return manifest
+
+def verify_dataset_cache(data_dir: str = DATA_DIR) -> bool:
+    """Check the cached files against the checksums in the manifest"""
+    manifest_path = os.path.join(data_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return False
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get('feature_names') != FEATURE_NAMES:
+        return False
+    for file_name, checksum in manifest['files'].items():
+        path = os.path.join(data_dir, file_name)
+        if not os.path.exists(path) or file_checksum(path) != checksum:
+            return False
+    return True
+
+def load_dataset(data_dir: str = DATA_DIR, source: Optional[str] = None,
+                 build: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """Memory-map the cached (features, target) arrays, building the cache if needed.
+
+    Checksums are verified once per process; a missing or corrupt cache is
+    rebuilt, or raises FileNotFoundError if build is False.
+    """
+    if data_dir not in _verified_dirs:
+        if not verify_dataset_cache(data_dir):
+            if not build:
+                raise FileNotFoundError(f"No verified dataset cache in {data_dir}")
+            build_dataset_cache(source, data_dir)
+        _verified_dirs.add(data_dir)
+
+    X = np.load(os.path.join(data_dir, FEATURES_FILE), mmap_mode='r')
+    y = np.load(os.path.join(data_dir, TARGET_FILE), mmap_mode='r')
+    return X, y
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the local California housing dataset cache")
+    parser.add_argument("--source", help="Local CSV or Parquet copy of the dataset")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--verify", action="store_true", help="Only verify the existing cache")
+    args = parser.parse_args()
+
+    if args.verify:
+        ok = verify_dataset_cache(args.data_dir)
+        print("Dataset cache OK" if ok else "Dataset cache missing or corrupt")
+        raise SystemExit(0 if ok else 1)
+
+    manifest = build_dataset_cache(args.source, args.data_dir)
+    print(f"Cached {manifest['rows']} rows in {args.data_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+"""Pickle-free export of the house price model.
+
+Supported models are written as plain .npy arrays plus a JSON manifest:
+- linear models (LinearRegression, Ridge, Lasso, ...): coefficients and intercept
+- tree models (DecisionTree, RandomForest, GradientBoosting and
+  HistGradientBoosting regressors): all trees flattened into shared node arrays
+
+Loading memory-maps the arrays and predicting uses NumPy only, so the
+serving path never imports scikit-learn or unpickles anything.
+
+Each export goes to its own versioned subdirectory. current.json, the
+pointer to the live version, is replaced atomically as the last step:
+
+    house_price_model_export/
+        current.json
+        <version>/coef.npy, intercept.npy      (linear)
+        <version>/feature.npy, threshold.npy, ...  (trees)
+
+Example:
+    python house_price_export.py --model-path house_price_model.pkl
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+from typing import Dict
+
+import numpy as np
+
+from house_price_model import EXPORT_DIR, EXPORT_POINTER_FILE as POINTER_FILE, FEATURE_NAMES, FEATURE_RANGES, MODEL_PATH
+
+TREE_ARRAYS = ['feature', 'threshold', 'left', 'right', 'value', 'missing_left', 'roots']
+
+def _sklearn_tree_nodes(tree) -> Dict[str, np.ndarray]:
+    """Node arrays of a fitted sklearn Tree object"""
+    left = tree.children_left.astype(np.int64)
+    right = tree.children_right.astype(np.int64)
+    is_leaf = left == -1
+    nodes = np.arange(tree.node_count)
+    missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=np.uint8))
+    return {
+        'feature': np.where(is_leaf, 0, tree.feature).astype(np.int32),
+        'threshold': tree.threshold.astype(np.float64),
+        # Leaves point at themselves so traversal can run a fixed number of steps
+        'left': np.where(is_leaf, nodes, left),
+        'right': np.where(is_leaf, nodes, right),
+        'value': tree.value[:, 0, 0].astype(np.float64),
+        'missing_left': missing_left.astype(bool),
+        'depth': tree.max_depth
+    }
+
+def _hist_tree_nodes(predictor) -> Dict[str, np.ndarray]:
+    """Node arrays of a fitted HistGradientBoosting TreePredictor"""
+    nodes = predictor.nodes
+    is_leaf = nodes['is_leaf'].astype(bool)
+    index = np.arange(len(nodes))
+    # Depth is not stored, so derive it from the parent links
+    depth = np.zeros(len(nodes), dtype=np.int64)
+    for i in range(len(nodes)):
+        if not is_leaf[i]:
+            depth[nodes['left'][i]] = depth[i] + 1
+            depth[nodes['right'][i]] = depth[i] + 1
+    return {
+        'feature': np.where(is_leaf, 0, nodes['feature_idx']).astype(np.int32),
+        'threshold': nodes['num_threshold'].astype(np.float64),
+        'left': np.where(is_leaf, index, nodes['left']).astype(np.int64),
+        'right': np.where(is_leaf, index, nodes['right']).astype(np.int64),
+        'value': nodes['value'].astype(np.float64),
+        'missing_left': nodes['missing_go_to_left'].astype(bool),
+        'depth': int(depth.max())
+    }
+
+def _flatten_trees(trees) -> Dict[str, np.ndarray]:
+    """Concatenate per-tree node arrays, offsetting child links"""
+    arrays = {name: [] for name in TREE_ARRAYS}
+    offset = 0
+    max_depth = 0
+    for tree in trees:
+        arrays['roots'].append(offset)
+        for name in ['feature', 'threshold', 'value', 'missing_left']:
+            arrays[name].append(tree[name])
+        arrays['left'].append(tree['left'] + offset)
+        arrays['right'].append(tree['right'] + offset)
+        offset += len(tree['value'])
+        max_depth = max(max_depth, tree['depth'])
+
+    flat = {name: np.concatenate(arrays[name]) for name in TREE_ARRAYS if name != 'roots'}
+    flat['left'] = flat['left'].astype(np.int32)
+    flat['right'] = flat['right'].astype(np.int32)
+    flat['roots'] = np.array(arrays['roots'], dtype=np.int32)
+    flat['max_depth'] = max_depth
+    return flat
+
+def model_to_arrays(model):
+    """Convert a fitted model to (metadata, arrays) or raise ValueError if unsupported"""
+    if hasattr(model, 'coef_') and hasattr(model, 'intercept_'):
+        meta = {'kind': 'linear'}
+        arrays = {
+            'coef': np.asarray(model.coef_, dtype=np.float64).ravel(),
+            'intercept': np.atleast_1d(np.asarray(model.intercept_, dtype=np.float64))
+        }
+        return meta, arrays
+
+    name = type(model).__name__
+    if name == 'DecisionTreeRegressor':
+        trees, aggregate, scale = [_sklearn_tree_nodes(model.tree_)], 'sum', 1.0
+    elif name in ('RandomForestRegressor', 'ExtraTreesRegressor'):
+        trees = [_sklearn_tree_nodes(estimator.tree_) for estimator in model.estimators_]
+        aggregate, scale = 'mean', 1.0
+    elif name == 'GradientBoostingRegressor':
+        trees = [_sklearn_tree_nodes(estimator.tree_) for estimator in model.estimators_[:, 0]]
+        aggregate, scale = 'sum', float(model.learning_rate)
+    elif name == 'HistGradientBoostingRegressor':
+        if getattr(model, 'is_categorical_', None) is not None and np.any(model.is_categorical_):
+            raise ValueError("Categorical features are not supported")
+        trees = [_hist_tree_nodes(predictors[0]) for predictors in model._predictors]
+        aggregate, scale = 'sum', 1.0
+    else:
+        raise ValueError(f"Unsupported model type: {name}")
+
+    arrays = _flatten_trees(trees)
+    meta = {'kind': 'trees', 'aggregate': aggregate, 'scale': scale,
+            'max_depth': int(arrays.pop('max_depth')), 'offset': 0.0}
+    return meta, arrays
+
+class NumpyModel:
+    """Predicts from exported arrays with NumPy only"""
+
+    def __init__(self, meta: dict, arrays: Dict[str, np.ndarray]):
+        self.meta = meta
+        self.arrays = arrays
+
+    def predict(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        if self.meta['kind'] == 'linear':
+            return X @ self.arrays['coef'] + self.arrays['intercept'][0]
+
+        a = self.arrays
+        roots = a['roots']
+        rows = np.arange(len(X))[:, None]
+        # Walk every tree for every row at once; leaves loop onto themselves
+        nodes = np.broadcast_to(roots, (len(X), len(roots))).copy()
+        for _ in range(self.meta['max_depth']):
+            values = X[rows, a['feature'][nodes]]
+            go_left = np.where(np.isnan(values), a['missing_left'][nodes], values <= a['threshold'][nodes])
+            nodes = np.where(go_left, a['left'][nodes], a['right'][nodes])
+
+        leaf_values = a['value'][nodes]
+        total = leaf_values.mean(axis=1) if self.meta['aggregate'] == 'mean' else leaf_values.sum(axis=1)
+        return self.meta['offset'] + self.meta['scale'] * total
+
+def prepare_export(model, probe_rows: int = 256):
+    """Checked (metadata, arrays) of a fitted model; meta['version'] is a hash of its content"""
+    meta, arrays = model_to_arrays(model)
+    meta['feature_names'] = FEATURE_NAMES
+
+    # Check the exported predictor against the original on random inputs. For
+    # boosting models this also recovers the constant baseline prediction.
+    rng = np.random.default_rng(0)
+    low, high = np.array([FEATURE_RANGES[name] for name in FEATURE_NAMES], dtype=np.float64).T
+    probe = rng.uniform(low, high, (probe_rows, len(FEATURE_NAMES)))
+    numpy_model = NumpyModel(meta, arrays)
+    expected = model.predict(probe)
+    if meta['kind'] == 'trees' and meta['aggregate'] == 'sum':
+        meta['offset'] = float(np.median(expected - numpy_model.predict(probe)))
+    if not np.allclose(numpy_model.predict(probe), expected, rtol=1e-6, atol=1e-6):
+        raise ValueError("Exported model does not reproduce the original predictions")
+
+    digest = hashlib.sha256(json.dumps(meta, sort_keys=True).encode())
+    for name in sorted(arrays):
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    meta['version'] = digest.hexdigest()[:12]
+    return meta, arrays
+
+def export_model(model, export_dir: str = EXPORT_DIR, probe_rows: int = 256) -> str:
+    """Export a fitted model and make it the current version. Returns the version."""
+    meta, arrays = prepare_export(model, probe_rows)
+    version = meta['version']
+
+    version_dir = os.path.join(export_dir, version)
+    if not os.path.exists(version_dir):
+        tmp_dir = f"{version_dir}.{os.getpid()}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_dir, f"{name}.npy"), np.ascontiguousarray(array))
+        os.replace(tmp_dir, version_dir)
+
+    pointer_path = os.path.join(export_dir, POINTER_FILE)
+    tmp_path = f"{pointer_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp_path, pointer_path)
+    return version
+
+def remove_export(export_dir: str = EXPORT_DIR):
+    """Retire the current export so loaders fall back to the pickle"""
+    pointer_path = os.path.join(export_dir, POINTER_FILE)
+    if os.path.exists(pointer_path):
+        os.remove(pointer_path)
+
+def load_exported_model(export_dir: str = EXPORT_DIR, meta: dict = None) -> NumpyModel:
+    """Memory-map the current export"""
+    if meta is None:
+        with open(os.path.join(export_dir, POINTER_FILE)) as f:
+            meta = json.load(f)
+    version_dir = os.path.join(export_dir, meta['version'])
+    names = ['coef', 'intercept'] if meta['kind'] == 'linear' else TREE_ARRAYS
+    arrays = {name: np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode='r') for name in names}
+    return NumpyModel(meta, arrays)
+
+def prune_exports(export_dir: str = EXPORT_DIR, keep: int = 3):
+    """Delete old version directories, keeping the newest ones and the current one"""
+    pointer_path = os.path.join(export_dir, POINTER_FILE)
+    current = None
+    if os.path.exists(pointer_path):
+        with open(pointer_path) as f:
+            current = json.load(f)['version']
+    versions = sorted(
+        (entry for entry in os.scandir(export_dir) if entry.is_dir() and not entry.name.endswith('.tmp')),
+        key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in versions[keep:]:
+        if entry.name != current:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the house price model without pickle")
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    parser.add_argument("--export-dir", default=None, help="Defaults to the model path without extension + _export")
+    args = parser.parse_args()
+
+    import pickle
+    from house_price_model import export_dir_for
+
+    export_dir = args.export_dir or export_dir_for(args.model_path)
+    with open(args.model_path, 'rb') as f:
+        model = pickle.load(f)
+    version = export_model(model, export_dir)
+    prune_exports(export_dir)
+    print(f"Exported {type(model).__name__} as version {version} to {export_dir}")
+
+if __name__ == "__main__":
+    main()
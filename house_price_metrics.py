@@ -0,0 +1,232 @@
+"""Latency and input drift monitoring for the house price model.
+
+Monitor keeps, per process and without storing raw requests:
+- latency histograms per stage (load, predict, render, ...) on fixed
+  log-spaced buckets
+- prediction counters per model version
+- per-feature streaming statistics: running mean/variance (batched
+  Welford updates) and a fixed-bin histogram over the feature's input
+  range, which serves as the quantile sketch
+- drift scores against the training data: population stability index
+  (PSI) on the sketch bins, and the mean shift in training standard
+  deviations
+
+Snapshots can be exported as JSON (write_json) or Prometheus text format
+(to_prometheus).
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from house_price_model import FEATURE_NAMES, FEATURE_RANGES
+
+METRICS_PATH = 'house_price_metrics.json'
+
+LATENCY_BUCKETS_SECONDS = np.array([0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                                    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0])
+SKETCH_BINS = 50
+
+class LatencyHistogram:
+    """Cumulative-friendly latency histogram with fixed bucket bounds"""
+
+    def __init__(self):
+        self.counts = np.zeros(len(LATENCY_BUCKETS_SECONDS) + 1, dtype=np.int64)
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[np.searchsorted(LATENCY_BUCKETS_SECONDS, seconds)] += 1
+        self.total += seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bucket bound containing the q-quantile"""
+        count = self.counts.sum()
+        if count == 0:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.counts), q * count))
+        return float(LATENCY_BUCKETS_SECONDS[index]) if index < len(LATENCY_BUCKETS_SECONDS) else float('inf')
+
+    def snapshot(self) -> dict:
+        count = int(self.counts.sum())
+        return {
+            'count': count,
+            'mean_ms': self.total / count * 1000 if count else 0.0,
+            'p50_ms': self.quantile(0.5) * 1000,
+            'p95_ms': self.quantile(0.95) * 1000,
+            'p99_ms': self.quantile(0.99) * 1000
+        }
+
+class FeatureStats:
+    """Streaming mean/variance and binned sketch of every feature"""
+
+    def __init__(self):
+        n = len(FEATURE_NAMES)
+        self.count = 0
+        self.mean = np.zeros(n)
+        self.m2 = np.zeros(n)
+        # Bins span the input range; the first and last bins catch out-of-range values
+        self.edges = [np.linspace(*FEATURE_RANGES[name], SKETCH_BINS + 1)[1:-1] for name in FEATURE_NAMES]
+        self.bins = np.zeros((n, SKETCH_BINS), dtype=np.int64)
+
+    def update(self, rows: np.ndarray):
+        rows = np.asarray(rows, dtype=np.float64)
+        batch_count = len(rows)
+        if batch_count == 0:
+            return
+        batch_mean = rows.mean(axis=0)
+        batch_m2 = ((rows - batch_mean) ** 2).sum(axis=0)
+
+        # Chan et al. merge of the batch into the running moments
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.mean = self.mean + delta * batch_count / total
+        self.m2 = self.m2 + batch_m2 + delta ** 2 * self.count * batch_count / total
+        self.count = total
+
+        for i, edges in enumerate(self.edges):
+            self.bins[i] += np.bincount(np.searchsorted(edges, rows[:, i]), minlength=SKETCH_BINS)
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.m2 / self.count) if self.count else np.zeros(len(FEATURE_NAMES))
+
+    def quantile(self, feature: int, q: float) -> float:
+        """Approximate quantile from the sketch (bin midpoint)"""
+        counts = self.bins[feature]
+        if counts.sum() == 0:
+            return float('nan')
+        index = int(np.searchsorted(np.cumsum(counts), q * counts.sum()))
+        low, high = FEATURE_RANGES[FEATURE_NAMES[feature]]
+        width = (high - low) / SKETCH_BINS
+        return low + (index + 0.5) * width
+
+def population_stability_index(expected: np.ndarray, actual: np.ndarray, epsilon: float = 1e-4) -> float:
+    """PSI between two binned distributions"""
+    expected = expected / max(expected.sum(), 1) + epsilon
+    actual = actual / max(actual.sum(), 1) + epsilon
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+class Monitor:
+    """Process-wide latency, volume and drift instrumentation"""
+
+    def __init__(self, reference: Optional[FeatureStats] = None,
+                 reference_loader: Optional[Callable[[], FeatureStats]] = None):
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.predictions_by_version: Dict[str, int] = {}
+        self.features = FeatureStats()
+        self.reference = reference
+        self.started = time.time()
+        self._reference_loader = reference_loader
+        self._reference_lock = threading.Lock()
+        self._last_write = float('-inf')
+        self._lock = threading.Lock()
+
+    def observe_latency(self, stage: str, seconds: float):
+        with self._lock:
+            self.latency.setdefault(stage, LatencyHistogram()).observe(seconds)
+
+    @contextmanager
+    def timed(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_latency(stage, time.perf_counter() - start)
+
+    def record_predictions(self, version: str, rows):
+        """Count predictions for a model version and add their inputs to the feature stats"""
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        with self._lock:
+            self.predictions_by_version[version] = self.predictions_by_version.get(version, 0) + len(rows)
+            self.features.update(rows)
+
+    def load_reference(self):
+        """Build the training reference with reference_loader once drift can be scored"""
+        if self.reference is not None or self._reference_loader is None or self.features.count == 0:
+            return
+        with self._reference_lock:
+            if self.reference is None:
+                try:
+                    self.reference = self._reference_loader()
+                except (OSError, ValueError):
+                    pass  # No dataset available yet; drift scores are skipped
+
+    def drift(self) -> Dict[str, dict]:
+        """Per-feature drift of live inputs against the training reference"""
+        if self.reference is None or self.features.count == 0:
+            return {}
+        reference_std = np.where(self.reference.std > 0, self.reference.std, 1.0)
+        mean_shift = (self.features.mean - self.reference.mean) / reference_std
+        return {
+            name: {
+                'psi': population_stability_index(self.reference.bins[i], self.features.bins[i]),
+                'mean_shift_std': float(mean_shift[i]),
+                'live_mean': float(self.features.mean[i]),
+                'live_p50': self.features.quantile(i, 0.5)
+            }
+            for i, name in enumerate(FEATURE_NAMES)
+        }
+
+    def snapshot(self) -> dict:
+        self.load_reference()
+        with self._lock:
+            return {
+                'uptime_seconds': time.time() - self.started,
+                'latency': {stage: histogram.snapshot() for stage, histogram in self.latency.items()},
+                'predictions_by_version': dict(self.predictions_by_version),
+                'inputs_seen': self.features.count,
+                'drift': self.drift()
+            }
+
+    def maybe_write_json(self, path: str, interval_seconds: float = 10.0):
+        """Write the snapshot file at most once per interval"""
+        now = time.monotonic()
+        if now - self._last_write >= interval_seconds:
+            self._last_write = now
+            self.write_json(path)
+
+    def write_json(self, path: str):
+        """Atomically write the current snapshot to a file"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    def to_prometheus(self) -> str:
+        """Current metrics in Prometheus text exposition format"""
+        lines = []
+        self.load_reference()
+        with self._lock:
+            lines.append("# TYPE house_price_latency_seconds histogram")
+            for stage, histogram in self.latency.items():
+                cumulative = np.cumsum(histogram.counts)
+                for bound, count in zip(LATENCY_BUCKETS_SECONDS, cumulative):
+                    lines.append(f'house_price_latency_seconds_bucket{{stage="{stage}",le="{bound}"}} {count}')
+                lines.append(f'house_price_latency_seconds_bucket{{stage="{stage}",le="+Inf"}} {cumulative[-1]}')
+                lines.append(f'house_price_latency_seconds_sum{{stage="{stage}"}} {histogram.total}')
+                lines.append(f'house_price_latency_seconds_count{{stage="{stage}"}} {cumulative[-1]}')
+            lines.append("# TYPE house_price_predictions_total counter")
+            for version, count in self.predictions_by_version.items():
+                lines.append(f'house_price_predictions_total{{model_version="{version}"}} {count}')
+            drift = self.drift()
+            lines.append("# TYPE house_price_feature_psi gauge")
+            for name, scores in drift.items():
+                lines.append(f'house_price_feature_psi{{feature="{name}"}} {scores["psi"]}')
+            lines.append("# TYPE house_price_feature_mean_shift_std gauge")
+            for name, scores in drift.items():
+                lines.append(f'house_price_feature_mean_shift_std{{feature="{name}"}} {scores["mean_shift_std"]}')
+        return "\n".join(lines) + "\n"
+
+def training_reference(chunk_rows: int = 100_000, build_cache: bool = True) -> FeatureStats:
+    """Feature statistics of the cached training dataset"""
+    from house_price_data import load_dataset
+
+    X, _ = load_dataset(build=build_cache)
+    reference = FeatureStats()
+    for start in range(0, len(X), chunk_rows):
+        reference.update(X[start:start + chunk_rows])
+    return reference
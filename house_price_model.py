@@ -0,0 +1,192 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+MODEL_PATH = 'house_price_model.pkl'
+
+# Pickle-free copy of the model, see house_price_export.py. Every pickle has
+# its own export directory next to it, so experiments don't replace this one.
+EXPORT_DIR = 'house_price_model_export'
+EXPORT_POINTER_FILE = 'current.json'
+
+FEATURE_NAMES = ['MedInc', 'HouseAge', 'AveRooms', 'AveBedrms', 'Population', 'AveOccup', 'Latitude', 'Longitude']
+
+# Input ranges, defaults and decimal precision of the task2.py number inputs
+FEATURE_RANGES = {
+    'MedInc': (0.0, 20.0),
+    'HouseAge': (1, 100),
+    'AveRooms': (1.0, 20.0),
+    'AveBedrms': (1.0, 10.0),
+    'Population': (1, 10000),
+    'AveOccup': (1.0, 10.0),
+    'Latitude': (32.0, 42.0),
+    'Longitude': (-124.0, -114.0)
+}
+DEFAULT_FEATURES = [3.0, 20, 5.0, 1.0, 1000, 3.0, 34.0, -120.0]
+FEATURE_DECIMALS = [2, 0, 2, 2, 0, 2, 2, 2]
+
+@contextmanager
+def file_lock(lock_path: str, timeout: float = 600.0, stale_after: float = 600.0):
+    """Cross-process lock based on exclusive creation of a lock file"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            # Break locks left behind by a crashed process
+            try:
+                if time.time() - os.path.getmtime(lock_path) > stale_after:
+                    os.remove(lock_path)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {lock_path}")
+            time.sleep(0.1)
+    try:
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        yield
+    finally:
+        try:
+            os.remove(lock_path)
+        except FileNotFoundError:
+            pass
+
+def export_dir_for(path: str) -> str:
+    """Export directory that belongs to a pickle, e.g. house_price_model_export for house_price_model.pkl"""
+    return os.path.splitext(path)[0] + '_export'
+
+def train_and_save_model(path: str = MODEL_PATH):
+    """Train the model and atomically write it to path"""
+    from sklearn.model_selection import train_test_split
+    from sklearn.linear_model import LinearRegression
+    from house_price_data import load_dataset
+
+    X, y = load_dataset()
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    model = LinearRegression()
+    model.fit(X_train, y_train)
+    save_model(model, path)
+
+def save_model(model, path: str = MODEL_PATH, export_dir: Optional[str] = None):
+    """Atomically write a model artifact, plus its pickle-free export when supported.
+
+    export_dir defaults to the pickle's own export directory; '' skips the export.
+    """
+    export_dir = export_dir_for(path) if export_dir is None else export_dir
+
+    # Write to a temporary file first so readers never see a partial artifact
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(model, f)
+    os.replace(tmp_path, path)
+
+    if export_dir:
+        write_export(model, export_dir)
+
+def write_export(model, export_dir: str):
+    """Export a model, or retire the old export if the model can't be exported"""
+    from house_price_export import export_model, remove_export
+    try:
+        export_model(model, export_dir)
+    except ValueError:
+        # Don't leave an export of an older model in front of the new pickle
+        remove_export(export_dir)
+
+def ensure_model(path: str = MODEL_PATH):
+    """Train the model unless it exists, letting only one process train at a time"""
+    if os.path.exists(path):
+        return
+    with file_lock(path + '.lock'):
+        # Another process may have finished training while we waited
+        if not os.path.exists(path):
+            train_and_save_model(path)
+
+def pickle_version(model, data: bytes) -> str:
+    """Version of a pickled model: its export version if it can be exported, else the pickle's hash"""
+    from house_price_export import prepare_export
+    try:
+        return prepare_export(model)[0]['version']
+    except ValueError:
+        return hashlib.sha256(data).hexdigest()[:12]
+
+def file_stat_of(path: str):
+    """(mtime_ns, size) of a file, or None if it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class ModelRegistry:
+    """Process-wide holder of the trained model.
+
+    The pickle-free export is preferred when it exists, so serving does not
+    import scikit-learn; otherwise the pickle is used. The artifact is loaded
+    once and kept in memory. Its version is a hash of the model's content,
+    the same for the pickle and the export of one model, and both files are
+    checked for changes at most every check_interval seconds so a retrained
+    model is picked up without a restart. A pickle newer than its export is
+    exported again before loading.
+    """
+
+    def __init__(self, path: str = MODEL_PATH, export_dir: Optional[str] = None, check_interval: float = 1.0):
+        self.path = path
+        self.export_dir = export_dir_for(path) if export_dir is None else export_dir
+        self.check_interval = check_interval
+        self.current = (None, None)
+        self._file_stat = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def get(self):
+        """Get the current (model, version) pair"""
+        if self.current[0] is None or time.monotonic() - self._last_check >= self.check_interval:
+            self.refresh()
+        return self.current
+
+    def refresh(self):
+        """Reload the model if the artifact on disk has changed"""
+        with self._lock:
+            self._last_check = time.monotonic()
+            pointer_path = os.path.join(self.export_dir, EXPORT_POINTER_FILE) if self.export_dir else None
+            if pointer_path is None or not os.path.exists(pointer_path):
+                ensure_model(self.path)
+            pickle_stat = file_stat_of(self.path)
+            # Training writes the export as well, so look for it after ensure_model
+            exported = pointer_path is not None and os.path.exists(pointer_path)
+            if exported and pickle_stat is not None and pickle_stat[0] > os.stat(pointer_path).st_mtime_ns:
+                # The pickle was replaced without going through save_model
+                with open(self.path, 'rb') as f:
+                    write_export(pickle.load(f), self.export_dir)
+                exported = os.path.exists(pointer_path)
+            artifact_path = pointer_path if exported else self.path
+
+            file_stat = (artifact_path, file_stat_of(artifact_path), pickle_stat)
+            if self.current[0] is not None and file_stat == self._file_stat:
+                return
+
+            with open(artifact_path, 'rb') as f:
+                data = f.read()
+            if exported:
+                from house_price_export import load_exported_model
+                meta = json.loads(data)
+                model, version = load_exported_model(self.export_dir, meta), meta['version']
+            else:
+                model = pickle.loads(data)
+                version = pickle_version(model, data)
+            # The same model in another format keeps its version, and with it the caches
+            self.current = (model, version)
+            self._file_stat = file_stat
+
+    def predict(self, features):
+        """Predict with the current model"""
+        model, _ = self.get()
+        return model.predict(features)
@@ -0,0 +1,43 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from house_price_model import DEFAULT_FEATURES, FEATURE_NAMES, FEATURE_RANGES
+
+def feature_axis(name: str, steps: int) -> np.ndarray:
+    """Evenly spaced values over a feature's input range"""
+    low, high = FEATURE_RANGES[name]
+    return np.linspace(low, high, steps)
+
+def sweep(model, base: List[float], feature_x: str, feature_y: Optional[str] = None,
+          steps: int = 50) -> pd.DataFrame:
+    """Predict over a 1D or 2D grid around base in a single predict call.
+
+    Returns one row per grid point with the swept feature values and the prediction.
+    """
+    xs = feature_axis(feature_x, steps)
+    if feature_y is None:
+        grid = np.tile(np.array(base, dtype=np.float64), (len(xs), 1))
+        grid[:, FEATURE_NAMES.index(feature_x)] = xs
+        return pd.DataFrame({feature_x: xs, 'prediction': model.predict(grid)})
+
+    ys = feature_axis(feature_y, steps)
+    mesh_x, mesh_y = np.meshgrid(xs, ys)
+    grid = np.tile(np.array(base, dtype=np.float64), (mesh_x.size, 1))
+    grid[:, FEATURE_NAMES.index(feature_x)] = mesh_x.ravel()
+    grid[:, FEATURE_NAMES.index(feature_y)] = mesh_y.ravel()
+    return pd.DataFrame({feature_x: mesh_x.ravel(), feature_y: mesh_y.ravel(), 'prediction': model.predict(grid)})
+
+def contributions(model, base: List[float], reference: Optional[List[float]] = None) -> pd.Series:
+    """How much each feature moves the prediction away from the reference input.
+
+    Each contribution is f(base) minus f(base with that one feature reset to
+    the reference value). All nine inputs are priced in one predict call.
+    """
+    reference = DEFAULT_FEATURES if reference is None else reference
+    rows = np.tile(np.array(base, dtype=np.float64), (len(FEATURE_NAMES) + 1, 1))
+    for i in range(len(FEATURE_NAMES)):
+        rows[i + 1, i] = reference[i]
+    predictions = model.predict(rows)
+    return pd.Series(predictions[0] - predictions[1:], index=FEATURE_NAMES)
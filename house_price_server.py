@@ -0,0 +1,318 @@
+"""Standalone asyncio prediction service for the house price model.
+
+Concurrent single-row requests are coalesced into micro-batches. A batch
+is closed at max_batch_size rows or max_wait_ms after its first row,
+whichever comes first. Each batch is priced with one vectorized predict
+call on a worker thread, so new requests keep queueing in the meantime.
+Loading the model (and training it on a first start) also happens off the
+event loop; a background task checks for a new model version.
+
+Endpoints:
+    POST /predict   {"features": [8 numbers]} or {"MedInc": ..., ..., "Longitude": ...}
+    GET  /health    model version and queue depth
+    GET  /metrics   request, batch, cache, latency and input drift metrics (JSON)
+    GET  /metrics/prometheus   the latency, volume and drift metrics in Prometheus format
+
+Example:
+    python house_price_server.py serve --port 8080 --max-batch-size 256 --max-wait-ms 2
+    python house_price_server.py loadtest --port 8080 --concurrency 200 --requests 50000
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+from house_price_cache import PredictionCache, is_quantized
+from house_price_metrics import Monitor, training_reference
+from house_price_model import FEATURE_NAMES, ModelRegistry
+
+class MicroBatcher:
+    """Coalesces single-row predictions into batched predict calls"""
+
+    def __init__(self, registry: ModelRegistry, max_batch_size: int = 256, max_wait_ms: float = 2.0,
+                 cache: Optional[PredictionCache] = None, monitor: Optional[Monitor] = None):
+        self.registry = registry
+        self.cache = cache
+        self.monitor = monitor or Monitor()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.queue = asyncio.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batches = 0
+        self.rows = 0
+        # Cache hits are recorded in the monitor in batches, like the misses
+        self.hit_rows = []
+
+    async def watch_model(self):
+        """Pick up retrained models without loading them on the event loop"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await loop.run_in_executor(None, self.registry.refresh)
+            self.record_hits()
+            await asyncio.sleep(self.registry.check_interval)
+
+    def record_hits(self):
+        """Add the buffered cache hits to the monitor's version counts and drift statistics"""
+        rows_by_version = {}
+        for version, row in self.hit_rows:
+            rows_by_version.setdefault(version, []).append(row)
+        self.hit_rows = []
+        for version, rows in rows_by_version.items():
+            self.monitor.record_predictions(version, rows)
+
+    async def predict(self, row: List[float]) -> Tuple[float, str]:
+        """Queue one row and wait for its (prediction, model version)"""
+        # The cache is keyed at the UI's input precision, so finer rows bypass it
+        if self.cache is not None and is_quantized(row):
+            _, version = self.registry.current
+            prediction = self.cache.get(version, row)
+            if prediction is not None:
+                self.hit_rows.append((version, row))
+                if len(self.hit_rows) >= self.max_batch_size:
+                    self.record_hits()
+                return prediction, version
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((row, future))
+        return await future
+
+    async def collect_batch(self) -> list:
+        """Wait for the first row, then gather more until the batch is full or the wait expires"""
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            if not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def predict_batch(self, rows: List[List[float]]):
+        """Run one vectorized predict for a whole batch"""
+        with self.monitor.timed('load'):
+            model, version = self.registry.get()
+        features = np.array(rows, dtype=np.float64)
+        with self.monitor.timed('predict'):
+            predictions = model.predict(features)
+        self.monitor.record_predictions(version, features)
+        return predictions, version
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self.collect_batch()
+            try:
+                predictions, version = await loop.run_in_executor(
+                    self.executor, self.predict_batch, [row for row, _ in batch])
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += len(batch)
+            for (row, future), prediction in zip(batch, predictions.tolist()):
+                if self.cache is not None and is_quantized(row):
+                    self.cache.put(version, row, prediction)
+                if not future.done():
+                    future.set_result((prediction, version))
+
+class PredictionServer:
+    """Minimal HTTP/1.1 front end with keep-alive"""
+
+    def __init__(self, batcher: MicroBatcher):
+        self.batcher = batcher
+        self.requests = 0
+        self.errors = 0
+
+    def parse_features(self, body: bytes) -> List[float]:
+        payload = json.loads(body)
+        if isinstance(payload, dict) and 'features' in payload:
+            row = payload['features']
+        elif isinstance(payload, dict):
+            row = [payload[name] for name in FEATURE_NAMES]
+        else:
+            raise ValueError("Expected a JSON object")
+        if len(row) != len(FEATURE_NAMES):
+            raise ValueError(f"Expected {len(FEATURE_NAMES)} features")
+        row = [float(value) for value in row]
+        if not all(np.isfinite(row)):
+            raise ValueError("Features must be finite numbers")
+        return row
+
+    def metrics(self) -> dict:
+        self.batcher.record_hits()
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'batches': self.batcher.batches,
+            'rows': self.batcher.rows,
+            'mean_batch_size': self.batcher.rows / self.batcher.batches if self.batcher.batches else 0.0,
+            'queue_depth': self.batcher.queue.qsize(),
+            'cache': self.batcher.cache.stats() if self.batcher.cache is not None else None,
+            **self.batcher.monitor.snapshot()
+        }
+
+    async def route(self, method: str, path: str, body: bytes) -> Tuple[int, Union[dict, str]]:
+        if method == 'POST' and path == '/predict':
+            start = time.perf_counter()
+            self.requests += 1
+            try:
+                row = self.parse_features(body)
+            except (ValueError, KeyError, TypeError) as e:
+                self.errors += 1
+                return 400, {'error': str(e)}
+            prediction, version = await self.batcher.predict(row)
+            self.batcher.monitor.observe_latency('request', time.perf_counter() - start)
+            return 200, {'prediction': prediction, 'model_version': version}
+        if method == 'GET' and path == '/health':
+            _, version = self.batcher.registry.current
+            return 200, {'status': 'ok', 'model_version': version, 'queue_depth': self.batcher.queue.qsize()}
+        if method == 'GET' and path == '/metrics':
+            return 200, self.metrics()
+        if method == 'GET' and path == '/metrics/prometheus':
+            self.batcher.record_hits()
+            return 200, self.batcher.monitor.to_prometheus()
+        return 404, {'error': 'Not found'}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+
+                status, payload = await self.route(method, path, body)
+                if isinstance(payload, str):
+                    data, content_type = payload.encode(), 'text/plain; version=0.0.4'
+                else:
+                    data, content_type = json.dumps(payload).encode(), 'application/json'
+                reason = {200: 'OK', 400: 'Bad Request', 404: 'Not Found'}[status]
+                writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode() + data)
+                await writer.drain()
+                if headers.get('connection', '').lower() == 'close':
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+async def serve(host: str, port: int, max_batch_size: int, max_wait_ms: float, cache_size: int = 0):
+    loop = asyncio.get_running_loop()
+    registry = ModelRegistry()
+    await loop.run_in_executor(None, registry.refresh)
+    cache = None
+    if cache_size > 0:
+        cache = PredictionCache(max_size=cache_size)
+        await loop.run_in_executor(None, cache.precompute, *registry.current)
+    try:
+        monitor = Monitor(training_reference(build_cache=False))
+    except (OSError, ValueError):
+        monitor = Monitor()  # No dataset cache; drift scores are skipped
+    batcher = MicroBatcher(registry, max_batch_size, max_wait_ms, cache, monitor)
+    server = PredictionServer(batcher)
+    batch_task = asyncio.create_task(batcher.run())
+    watch_task = asyncio.create_task(batcher.watch_model())
+    tcp_server = await asyncio.start_server(server.handle_connection, host, port)
+    print(f"Serving model {registry.current[1]} on http://{host}:{port}")
+    try:
+        async with tcp_server:
+            await tcp_server.serve_forever()
+    finally:
+        batch_task.cancel()
+        watch_task.cancel()
+
+async def send_request(reader, writer, method: str, path: str, payload=None) -> dict:
+    """Send one request on a keep-alive connection and read the JSON reply"""
+    body = json.dumps(payload).encode() if payload is not None else b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    return json.loads(await reader.readexactly(length))
+
+async def load_test(host: str, port: int, concurrency: int, total_requests: int):
+    """Hammer /predict from many keep-alive connections and report latency"""
+    latencies = []
+    per_client = total_requests // concurrency
+
+    async def client(seed):
+        rng = random.Random(seed)
+        reader, writer = await asyncio.open_connection(host, port)
+        for _ in range(per_client):
+            row = [rng.uniform(0, 15), rng.randint(1, 52), rng.uniform(2, 10), rng.uniform(1, 2),
+                   rng.randint(100, 5000), rng.uniform(1, 5), rng.uniform(32.5, 42), rng.uniform(-124, -114.5)]
+            start = time.perf_counter()
+            await send_request(reader, writer, 'POST', '/predict', {'features': row})
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    reader, writer = await asyncio.open_connection(host, port)
+    metrics = await send_request(reader, writer, 'GET', '/metrics')
+    writer.close()
+
+    latencies.sort()
+    print(f"Requests: {len(latencies)}  Elapsed: {elapsed:.2f}s  Throughput: {len(latencies) / elapsed:.0f} req/s")
+    for pct in (50, 95, 99):
+        print(f"p{pct}: {latencies[min(len(latencies) - 1, int(len(latencies) * pct / 100))] * 1000:.2f} ms")
+    print(f"Server mean batch size: {metrics['mean_batch_size']:.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-batching house price prediction service")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8080)
+    serve_parser.add_argument("--max-batch-size", type=int, default=256)
+    serve_parser.add_argument("--max-wait-ms", type=float, default=2.0)
+    serve_parser.add_argument("--cache-size", type=int, default=100_000, help="Prediction cache entries (0 disables)")
+
+    load_parser = subparsers.add_parser("loadtest")
+    load_parser.add_argument("--host", default="127.0.0.1")
+    load_parser.add_argument("--port", type=int, default=8080)
+    load_parser.add_argument("--concurrency", type=int, default=100)
+    load_parser.add_argument("--requests", type=int, default=10000)
+
+    args = parser.parse_args()
+    if args.command == "serve":
+        asyncio.run(serve(args.host, args.port, args.max_batch_size, args.max_wait_ms, args.cache_size))
+    else:
+        asyncio.run(load_test(args.host, args.port, args.concurrency, args.requests))
+
+if __name__ == "__main__":
+    main()
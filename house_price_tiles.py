@@ -0,0 +1,155 @@
+"""Precomputed price tiles over California for the map view.
+
+Predictions are computed once per model version on a latitude/longitude
+grid at several zoom levels. The other features are held at a fixed
+base input. Zoom level z covers the input range with 2**z x 2**z tiles of
+TILE_SIZE x TILE_SIZE float32 cells. Each level is stored as one .npy
+array (north-up), which the viewer memory-maps and slices, so panning
+and zooming never call the model.
+
+    house_price_tiles/<model version>_<base input hash>/
+        level_0.npy ... level_<max_zoom>.npy
+        manifest.json        (written last; marks the pyramid complete)
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from house_price_model import DEFAULT_FEATURES, FEATURE_NAMES, FEATURE_RANGES
+
+TILES_DIR = 'house_price_tiles'
+TILE_SIZE = 64
+MAX_ZOOM = 4
+
+LAT_INDEX = FEATURE_NAMES.index('Latitude')
+LON_INDEX = FEATURE_NAMES.index('Longitude')
+LAT_RANGE = FEATURE_RANGES['Latitude']
+LON_RANGE = FEATURE_RANGES['Longitude']
+
+def pyramid_dir(model_version: str, base: List[float], tiles_dir: str = TILES_DIR) -> str:
+    base_hash = hashlib.sha256(json.dumps([float(value) for value in base]).encode()).hexdigest()[:8]
+    return os.path.join(tiles_dir, f"{model_version}_{base_hash}")
+
+def cell_centers(zoom: int, tile_size: int = TILE_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitudes (north to south) and longitudes (west to east) of a level's cells"""
+    cells = tile_size * 2 ** zoom
+    lat_step = (LAT_RANGE[1] - LAT_RANGE[0]) / cells
+    lon_step = (LON_RANGE[1] - LON_RANGE[0]) / cells
+    lats = LAT_RANGE[1] - (np.arange(cells) + 0.5) * lat_step
+    lons = LON_RANGE[0] + (np.arange(cells) + 0.5) * lon_step
+    return lats, lons
+
+def build_pyramid(model, model_version: str, base: Optional[List[float]] = None, max_zoom: int = MAX_ZOOM,
+                  tile_size: int = TILE_SIZE, tiles_dir: str = TILES_DIR, workers: int = 4) -> str:
+    """Predict every zoom level in row-band chunks on a thread pool and write it to disk"""
+    base = DEFAULT_FEATURES if base is None else base
+    target_dir = pyramid_dir(model_version, base, tiles_dir)
+    tmp_dir = f"{target_dir}.{os.getpid()}.tmp"
+    os.makedirs(tmp_dir, exist_ok=True)
+
+    def predict_band(level, lats, lons, start, stop):
+        rows = np.tile(np.array(base, dtype=np.float64), ((stop - start) * len(lons), 1))
+        rows[:, LAT_INDEX] = np.repeat(lats[start:stop], len(lons))
+        rows[:, LON_INDEX] = np.tile(lons, stop - start)
+        level[start:stop] = model.predict(rows).reshape(stop - start, len(lons))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for zoom in range(max_zoom + 1):
+            lats, lons = cell_centers(zoom, tile_size)
+            level = np.lib.format.open_memmap(os.path.join(tmp_dir, f"level_{zoom}.npy"), mode='w+',
+                                              dtype=np.float32, shape=(len(lats), len(lons)))
+            # One tile row per task keeps each predict call to a bounded batch
+            futures = [pool.submit(predict_band, level, lats, lons, start, min(start + tile_size, len(lats)))
+                       for start in range(0, len(lats), tile_size)]
+            for future in futures:
+                future.result()
+            level.flush()
+            del level
+
+    manifest = {'model_version': model_version, 'base': [float(value) for value in base],
+                'max_zoom': max_zoom, 'tile_size': tile_size}
+    with open(os.path.join(tmp_dir, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    if os.path.exists(target_dir):
+        shutil.rmtree(target_dir)
+    os.replace(tmp_dir, target_dir)
+    return target_dir
+
+class TilePyramid:
+    """Read-only view of a built pyramid with an in-memory tile cache shared by threads"""
+
+    def __init__(self, directory: str, cache_tiles: int = 256):
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        self.tile_size = self.manifest['tile_size']
+        self.max_zoom = self.manifest['max_zoom']
+        self.levels = [np.load(os.path.join(directory, f"level_{zoom}.npy"), mmap_mode='r')
+                       for zoom in range(self.max_zoom + 1)]
+        self.cache_tiles = cache_tiles
+        self.tile_cache = {}
+        self._lock = threading.Lock()
+
+    def tile(self, zoom: int, x: int, y: int) -> np.ndarray:
+        """One tile as a TILE_SIZE x TILE_SIZE float32 array (y counts from the north)"""
+        key = (zoom, x, y)
+        with self._lock:
+            tile = self.tile_cache.pop(key, None)
+            if tile is not None:
+                self.tile_cache[key] = tile  # Re-insert as most recently used
+                return tile
+
+        size = self.tile_size
+        tile = np.array(self.levels[zoom][y * size:(y + 1) * size, x * size:(x + 1) * size])
+        with self._lock:
+            self.tile_cache[key] = tile
+            if len(self.tile_cache) > self.cache_tiles:
+                self.tile_cache.pop(next(iter(self.tile_cache)))
+        return tile
+
+    def viewport(self, zoom: int, center_lat: float, center_lon: float, span_tiles: int = 2) -> Tuple[np.ndarray, tuple]:
+        """Cells around a center point, assembled from tiles.
+
+        Returns the array and its (lat_min, lat_max, lon_min, lon_max) bounds.
+        """
+        size = self.tile_size
+        tiles_per_side = 2 ** zoom
+        span_tiles = min(span_tiles, tiles_per_side)
+        cells = size * tiles_per_side
+
+        center_row = (LAT_RANGE[1] - center_lat) / (LAT_RANGE[1] - LAT_RANGE[0]) * cells
+        center_col = (center_lon - LON_RANGE[0]) / (LON_RANGE[1] - LON_RANGE[0]) * cells
+        first_y = int(np.clip(round(center_row / size - span_tiles / 2), 0, tiles_per_side - span_tiles))
+        first_x = int(np.clip(round(center_col / size - span_tiles / 2), 0, tiles_per_side - span_tiles))
+
+        view = np.block([[self.tile(zoom, x, y) for x in range(first_x, first_x + span_tiles)]
+                         for y in range(first_y, first_y + span_tiles)])
+        lat_step = (LAT_RANGE[1] - LAT_RANGE[0]) / cells
+        lon_step = (LON_RANGE[1] - LON_RANGE[0]) / cells
+        bounds = (LAT_RANGE[1] - (first_y + span_tiles) * size * lat_step,
+                  LAT_RANGE[1] - first_y * size * lat_step,
+                  LON_RANGE[0] + first_x * size * lon_step,
+                  LON_RANGE[0] + (first_x + span_tiles) * size * lon_step)
+        return view, bounds
+
+def get_pyramid(model, model_version: str, base: Optional[List[float]] = None, tiles_dir: str = TILES_DIR) -> TilePyramid:
+    """Open the pyramid for a model version, building it the first time"""
+    base = DEFAULT_FEATURES if base is None else base
+    directory = pyramid_dir(model_version, base, tiles_dir)
+    if not os.path.exists(os.path.join(directory, 'manifest.json')):
+        build_pyramid(model, model_version, base, tiles_dir=tiles_dir)
+    return TilePyramid(directory)
+
+def colorize(values: np.ndarray, low: float, high: float) -> np.ndarray:
+    """Map values to an RGB image on a blue-yellow-red scale"""
+    scaled = np.clip((values - low) / (high - low or 1.0), 0.0, 1.0)
+    stops = [0.0, 0.5, 1.0]
+    red = np.interp(scaled, stops, [49, 254, 215])
+    green = np.interp(scaled, stops, [54, 224, 48])
+    blue = np.interp(scaled, stops, [149, 144, 39])
+    return np.stack([red, green, blue], axis=-1).astype(np.uint8)
@@ -0,0 +1,184 @@
+"""Model search for the house price app.
+
+Every candidate regressor and hyperparameter setting is scored with k-fold
+cross-validation on the training split. The (candidate, fold) fits run in
+parallel with joblib. Each result records validation RMSE, fit wall time
+and measured predict latency per row. The most accurate candidate that
+fits the latency budget is refit on the whole training split and saved as
+the app's model, with its metrics next to it.
+
+Example:
+    python house_price_training.py --folds 5 --jobs -1 --max-latency-us 5
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Lasso, LinearRegression, Ridge
+from sklearn.model_selection import KFold, train_test_split
+
+from house_price_data import DATA_DIR, load_dataset
+from house_price_model import MODEL_PATH, save_model
+
+CANDIDATES = {
+    'linear': (LinearRegression(), {}),
+    'ridge': (Ridge(), {'alpha': [0.1, 1.0, 10.0]}),
+    'lasso': (Lasso(max_iter=5000), {'alpha': [0.001, 0.01, 0.1]}),
+    'gradient_boosting': (HistGradientBoostingRegressor(random_state=42),
+                          {'learning_rate': [0.05, 0.1], 'max_leaf_nodes': [31, 63]}),
+    'random_forest': (RandomForestRegressor(random_state=42, n_jobs=1),
+                      {'n_estimators': [100], 'max_depth': [12, None]}),
+}
+
+def expand_grid(grid: Dict[str, list]) -> List[dict]:
+    """All parameter combinations of a grid"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+def get_fold_splits(n_rows: int, folds: int, seed: int, data_dir: str = DATA_DIR) -> List[tuple]:
+    """K-fold (train, validation) indices, cached on disk for reuse across runs"""
+    path = os.path.join(data_dir, f"folds_{n_rows}_{folds}_{seed}.npz")
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            return [(cached[f"train_{i}"], cached[f"val_{i}"]) for i in range(folds)]
+
+    splits = list(KFold(n_splits=folds, shuffle=True, random_state=seed).split(np.empty(n_rows)))
+    os.makedirs(data_dir, exist_ok=True)
+    arrays = {}
+    for i, (train_index, val_index) in enumerate(splits):
+        arrays[f"train_{i}"] = train_index
+        arrays[f"val_{i}"] = val_index
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, **arrays)
+    os.replace(tmp_path, path)
+    return splits
+
+def evaluate_fold(name: str, estimator, params: dict, X, y, train_index, val_index) -> dict:
+    """Fit one candidate on one fold and measure its error and speed"""
+    model = clone(estimator).set_params(**params)
+    start = time.perf_counter()
+    model.fit(X[train_index], y[train_index])
+    fit_seconds = time.perf_counter() - start
+
+    X_val = X[val_index]
+    start = time.perf_counter()
+    predictions = model.predict(X_val)
+    predict_seconds = time.perf_counter() - start
+
+    rmse = float(np.sqrt(np.mean((predictions - y[val_index]) ** 2)))
+    return {
+        'name': name,
+        'params': params,
+        'rmse': rmse,
+        'fit_seconds': fit_seconds,
+        'latency_us': predict_seconds / len(val_index) * 1e6
+    }
+
+def summarize(fold_results: List[dict]) -> List[dict]:
+    """Average the fold results of each candidate"""
+    grouped = {}
+    for result in fold_results:
+        key = (result['name'], json.dumps(result['params'], sort_keys=True))
+        grouped.setdefault(key, []).append(result)
+
+    summary = []
+    for (name, _), results in grouped.items():
+        rmses = [result['rmse'] for result in results]
+        summary.append({
+            'name': name,
+            'params': results[0]['params'],
+            'rmse': float(np.mean(rmses)),
+            'rmse_std': float(np.std(rmses)),
+            'fit_seconds': float(np.mean([result['fit_seconds'] for result in results])),
+            'latency_us': float(np.median([result['latency_us'] for result in results]))
+        })
+    return sorted(summary, key=lambda result: result['rmse'])
+
+def select_best(summary: List[dict], max_latency_us: Optional[float] = None) -> dict:
+    """Most accurate candidate within the latency budget"""
+    eligible = [result for result in summary if max_latency_us is None or result['latency_us'] <= max_latency_us]
+    if not eligible:
+        raise ValueError(f"No candidate predicts within {max_latency_us} us per row")
+    return min(eligible, key=lambda result: result['rmse'])
+
+def run_search(folds: int = 5, jobs: int = -1, seed: int = 42, max_latency_us: Optional[float] = None,
+               candidates: Optional[List[str]] = None, model_path: str = MODEL_PATH,
+               export_dir: Optional[str] = None) -> dict:
+    """Cross-validate all candidates, then refit and save the best one (exported next to model_path by default)"""
+    X, y = load_dataset()
+    train_index, test_index = train_test_split(np.arange(len(y)), test_size=0.2, random_state=seed)
+    X_train, y_train = np.asarray(X[train_index]), np.asarray(y[train_index])
+    splits = get_fold_splits(len(y_train), folds, seed)
+
+    tasks = [
+        (name, estimator, params, fold_train, fold_val)
+        for name, (estimator, grid) in CANDIDATES.items() if not candidates or name in candidates
+        for params in expand_grid(grid)
+        for fold_train, fold_val in splits
+    ]
+    start = time.perf_counter()
+    fold_results = Parallel(n_jobs=jobs)(
+        delayed(evaluate_fold)(name, estimator, params, X_train, y_train, fold_train, fold_val)
+        for name, estimator, params, fold_train, fold_val in tasks
+    )
+    search_seconds = time.perf_counter() - start
+
+    summary = summarize(fold_results)
+    best = select_best(summary, max_latency_us)
+
+    # Refit the winner on the full training split and score it on the held-out test split
+    estimator = CANDIDATES[best['name']][0]
+    model = clone(estimator).set_params(**best['params'])
+    model.fit(X_train, y_train)
+    test_predictions = model.predict(np.asarray(X[test_index]))
+    test_rmse = float(np.sqrt(np.mean((test_predictions - np.asarray(y[test_index])) ** 2)))
+
+    save_model(model, model_path, export_dir)
+    metrics = {
+        'best': best,
+        'test_rmse': test_rmse,
+        'folds': folds,
+        'search_seconds': search_seconds,
+        'candidates': summary
+    }
+    tmp_path = f"{model_path}.metrics.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(tmp_path, os.path.splitext(model_path)[0] + '.metrics.json')
+    return metrics
+
+def print_summary(metrics: dict):
+    """Print the search results as a table"""
+    print(f"{'candidate':<20}{'params':<45}{'rmse':>8}{'+/-':>8}{'fit s':>8}{'us/row':>9}")
+    for result in metrics['candidates']:
+        params = ", ".join(f"{key}={value}" for key, value in result['params'].items())
+        print(f"{result['name']:<20}{params:<45}{result['rmse']:>8.4f}{result['rmse_std']:>8.4f}"
+              f"{result['fit_seconds']:>8.2f}{result['latency_us']:>9.3f}")
+    best = metrics['best']
+    print(f"Best: {best['name']} {best['params']} (cv rmse {best['rmse']:.4f}, test rmse {metrics['test_rmse']:.4f}) "
+          f"found in {metrics['search_seconds']:.1f}s")
+
+def main():
+    parser = argparse.ArgumentParser(description="Search for the best house price model")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--jobs", type=int, default=-1, help="Parallel workers (-1 uses all cores)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-latency-us", type=float, default=None, help="Predict latency budget per row")
+    parser.add_argument("--candidates", nargs="*", choices=list(CANDIDATES), default=None)
+    parser.add_argument("--model-path", default=MODEL_PATH)
+    parser.add_argument("--export-dir", default=None, help="Defaults to the model path without extension + _export")
+    args = parser.parse_args()
+
+    metrics = run_search(args.folds, args.jobs, args.seed, args.max_latency_us, args.candidates, args.model_path,
+                         args.export_dir)
+    print_summary(metrics)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,459 @@
+import numpy as np
+import heapq
+import html
+import re
+import time
+from collections import Counter, defaultdict
+from typing import List, Dict, Optional, Set
+
+# Feed ranking settings
+RANK_TOP_K = 50
+# Recency is scored as created_at / RANK_TIME_SCALE, so a post needs e.g. one
+# extra point of engagement for every RANK_TIME_SCALE seconds of age. Being
+# linear in creation time, scores never need refreshing as the clock moves.
+RANK_TIME_SCALE = 6 * 3600
+RANK_WEIGHTS = {"likes": 1.0, "comments": 1.5, "affinity": 2.0, "hashtags": 0.5}
+
+HASHTAG_PATTERN = re.compile(r"#(\w+)")
+
+def extract_hashtags(caption: str) -> Set[str]:
+    """Get the lowercase hashtags used in a caption"""
+    return {tag.lower() for tag in HASHTAG_PATTERN.findall(caption)}
+
+def parse_age(time_text: str) -> int:
+    """Convert a relative time like '3h ago' to seconds"""
+    match = re.match(r"(\d+)\s*([smhd])", time_text)
+    if not match:
+        return 0  # "Just now"
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    return int(match.group(1)) * units[match.group(2)]
+
+class InstagramApp:
+    def __init__(self):
+        self.users = {
+            "john_doe": {
+                "name": "John Doe",
+                "bio": "Photography enthusiast 📸",
+                "followers": 1250,
+                "following": 890,
+                "posts": 45,
+                "profile_pic": "👨‍💼"
+            },
+            "jane_smith": {
+                "name": "Jane Smith",
+                "bio": "Travel lover ✈️ | Food blogger 🍕",
+                "followers": 2340,
+                "following": 567,
+                "posts": 78,
+                "profile_pic": "👩‍💼"
+            },
+            "mike_wilson": {
+                "name": "Mike Wilson",
+                "bio": "Fitness coach 💪 | Healthy living",
+                "followers": 890,
+                "following": 234,
+                "posts": 32,
+                "profile_pic": "🏃‍♂️"
+            },
+            "sarah_jones": {
+                "name": "Sarah Jones",
+                "bio": "Artist 🎨 | Creative soul",
+                "followers": 1567,
+                "following": 445,
+                "posts": 56,
+                "profile_pic": "👩‍🎨"
+            }
+        }
+        
+        self.posts = [
+            {
+                "id": 1,
+                "username": "john_doe",
+                "image": "🌅",
+                "caption": "Beautiful sunset at the beach! #sunset #beach #photography",
+                "likes": 234,
+                "comments": [
+                    {"username": "jane_smith", "text": "Amazing shot! 🔥", "time": "2h ago"},
+                    {"username": "mike_wilson", "text": "Love this! 😍", "time": "1h ago"}
+                ],
+                "time": "3h ago",
+                "location": "Miami Beach, FL",
+                "version": 0
+            },
+            {
+                "id": 2,
+                "username": "jane_smith",
+                "image": "🍕",
+                "caption": "Best pizza in town! 🍕 #food #pizza #delicious",
+                "likes": 456,
+                "comments": [
+                    {"username": "john_doe", "text": "Looks delicious! 😋", "time": "30m ago"},
+                    {"username": "sarah_jones", "text": "Where is this? 🤔", "time": "15m ago"}
+                ],
+                "time": "1h ago",
+                "location": "Pizza Palace, NYC",
+                "version": 0
+            },
+            {
+                "id": 3,
+                "username": "mike_wilson",
+                "image": "💪",
+                "caption": "Morning workout complete! 💪 #fitness #workout #motivation",
+                "likes": 189,
+                "comments": [
+                    {"username": "john_doe", "text": "Keep it up! 💪", "time": "45m ago"},
+                    {"username": "jane_smith", "text": "Inspiring! 🔥", "time": "20m ago"}
+                ],
+                "time": "2h ago",
+                "location": "Gym Central",
+                "version": 0
+            },
+            {
+                "id": 4,
+                "username": "sarah_jones",
+                "image": "🎨",
+                "caption": "New artwork in progress! 🎨 #art #creative #painting",
+                "likes": 567,
+                "comments": [
+                    {"username": "jane_smith", "text": "Stunning! 😍", "time": "1h ago"},
+                    {"username": "mike_wilson", "text": "Beautiful work! 👏", "time": "30m ago"}
+                ],
+                "time": "4h ago",
+                "location": "Studio Art",
+                "version": 0
+            }
+        ]
+        
+        self.stories = [
+            {"username": "john_doe", "image": "🌅", "time": "2h ago"},
+            {"username": "jane_smith", "image": "🍕", "time": "1h ago"},
+            {"username": "mike_wilson", "image": "💪", "time": "30m ago"},
+            {"username": "sarah_jones", "image": "🎨", "time": "15m ago"}
+        ]
+        
+        self.current_user = "john_doe"
+        self.likes_by_user = defaultdict(set)
+        self.follows_by_user = defaultdict(set, {"john_doe": {"jane_smith", "mike_wilson"}})
+        self.post_html_cache = {}
+        
+        # Ranking state per user: engagement signals, score of every post,
+        # the top-K post ids and a min-heap over them. Heap entries are
+        # invalidated lazily: an entry counts only while its post is in the
+        # top-K and its score is still current.
+        self.author_likes = defaultdict(Counter)
+        self.hashtag_interest = defaultdict(Counter)
+        self.post_scores = defaultdict(dict)
+        self.feed_members = defaultdict(set)
+        self.feed_heaps = defaultdict(list)
+        # Posts whose like or comment counts, which every user's ranking
+        # shares, changed since a user's scores were last brought up to date
+        self.dirty_posts = defaultdict(set)
+        self.stale_feeds = set()
+        
+        self.post_index = {}
+        self.post_hashtags = {}
+        self.posts_by_author = defaultdict(list)
+        self.posts_by_hashtag = defaultdict(list)
+        now = time.time()
+        for post in self.posts:
+            post["created_at"] = now - parse_age(post["time"])
+            self.index_post(post)
+        
+    @property
+    def liked_posts(self) -> Set[int]:
+        """Posts liked by the current user"""
+        return self.likes_by_user[self.current_user]
+        
+    @property
+    def following(self) -> Set[str]:
+        """Users the current user follows"""
+        return self.follows_by_user[self.current_user]
+        
+    @following.setter
+    def following(self, usernames):
+        self.follows_by_user[self.current_user] = set(usernames)
+        
+    def index_post(self, post: Dict):
+        """Add a post to the lookup indexes"""
+        self.post_index[post["id"]] = post
+        self.post_hashtags[post["id"]] = extract_hashtags(post["caption"])
+        self.posts_by_author[post["username"]].append(post)
+        for tag in self.post_hashtags[post["id"]]:
+            self.posts_by_hashtag[tag].append(post)
+        
+    def get_post(self, post_id: int) -> Optional[Dict]:
+        """Find a post by id"""
+        return self.post_index.get(post_id)
+        
+    def score_posts(self, posts: List[Dict], user: Optional[str] = None) -> np.ndarray:
+        """Score a batch of posts for a user (the current user by default)"""
+        user = user or self.current_user
+        following = self.follows_by_user[user]
+        author_likes = self.author_likes[user]
+        hashtag_interest = self.hashtag_interest[user]
+        created_at = np.array([post["created_at"] for post in posts], dtype=np.float64)
+        likes = np.array([post["likes"] for post in posts], dtype=np.float64)
+        comments = np.array([len(post["comments"]) for post in posts], dtype=np.float64)
+        affinity = np.array([
+            (post["username"] in following) + author_likes[post["username"]]
+            for post in posts
+        ], dtype=np.float64)
+        interest = np.array([
+            sum(hashtag_interest[tag] for tag in self.post_hashtags[post["id"]])
+            for post in posts
+        ], dtype=np.float64)
+        
+        return (
+            created_at / RANK_TIME_SCALE
+            + RANK_WEIGHTS["likes"] * np.log1p(np.maximum(likes, 0))
+            + RANK_WEIGHTS["comments"] * np.log1p(comments)
+            + RANK_WEIGHTS["affinity"] * np.log1p(affinity)
+            + RANK_WEIGHTS["hashtags"] * np.log1p(interest)
+        )
+        
+    def posts_changed(self, posts: List[Dict]):
+        """Rescore posts whose likes or comments changed: now for the current user, on next read for the others"""
+        for user in self.post_scores:
+            if user != self.current_user:
+                self.dirty_posts[user].update(post["id"] for post in posts)
+        self.rescore_posts(posts)
+        
+    def rescore_posts(self, posts: List[Dict], user: Optional[str] = None):
+        """Recompute a user's scores for some posts and update their top-K heap"""
+        user = user or self.current_user
+        if not posts or user not in self.post_scores:
+            return  # Scored in full on the first ranked read
+        scores = self.post_scores[user]
+        members = self.feed_members[user]
+        heap = self.feed_heaps[user]
+        
+        for post, score in zip(posts, self.score_posts(posts, user).tolist()):
+            post_id = post["id"]
+            old_score = scores.get(post_id)
+            if score == old_score:
+                continue
+            scores[post_id] = score
+            if user in self.stale_feeds:
+                continue  # get_ranked_feed rebuilds the heap from the scores
+            if post_id in members:
+                if score < old_score:
+                    # A post outside the top-K may now outrank it
+                    self.stale_feeds.add(user)
+                else:
+                    heapq.heappush(heap, (score, post_id))  # The old entry is now invalid
+            elif len(members) < RANK_TOP_K:
+                members.add(post_id)
+                heapq.heappush(heap, (score, post_id))
+            else:
+                # None if every member dropped, which marks the feed stale
+                minimum = self.feed_minimum(user)
+                if minimum is not None and score > minimum[0]:
+                    members.discard(heapq.heappop(heap)[1])
+                    members.add(post_id)
+                    heapq.heappush(heap, (score, post_id))
+        
+        # Invalid entries pile up as member scores rise; drop them once they outnumber the valid ones
+        if user not in self.stale_feeds and len(heap) > 2 * RANK_TOP_K:
+            heap[:] = [(scores[post_id], post_id) for post_id in members]
+            heapq.heapify(heap)
+        
+    def feed_minimum(self, user: str) -> Optional[tuple]:
+        """Lowest valid (score, post_id) entry of a user's top-K heap, discarding invalid ones above it.
+
+        Returns None and marks the feed stale if no valid entry is left.
+        """
+        heap = self.feed_heaps[user]
+        scores = self.post_scores[user]
+        members = self.feed_members[user]
+        while heap and (heap[0][1] not in members or scores[heap[0][1]] != heap[0][0]):
+            heapq.heappop(heap)
+        if not heap:
+            self.stale_feeds.add(user)
+            return None
+        return heap[0]
+        
+    def get_ranked_feed(self) -> List[Dict]:
+        """Get the current user's top posts by score"""
+        user = self.current_user
+        if user not in self.post_scores:
+            scores = self.score_posts(self.posts, user).tolist()
+            self.post_scores[user] = {post["id"]: score for post, score in zip(self.posts, scores)}
+            self.dirty_posts.pop(user, None)
+            self.stale_feeds.add(user)
+        elif self.dirty_posts.get(user):
+            dirty = self.dirty_posts.pop(user)
+            self.rescore_posts([self.post_index[post_id] for post_id in dirty], user)
+        
+        scores = self.post_scores[user]
+        if user in self.stale_feeds:
+            heap = heapq.nlargest(RANK_TOP_K, ((score, post_id) for post_id, score in scores.items()))
+            heapq.heapify(heap)
+            self.feed_heaps[user] = heap
+            self.feed_members[user] = {post_id for _, post_id in heap}
+            self.stale_feeds.discard(user)
+        
+        ranked = sorted(((scores[post_id], post_id) for post_id in self.feed_members[user]), reverse=True)
+        return [self.post_index[post_id] for _, post_id in ranked]
+        
+    def like_post(self, post_id: int):
+        """Like or unlike a post"""
+        post = self.post_index.get(post_id)
+        if post is None:
+            return
+        
+        if post_id in self.liked_posts:
+            self.liked_posts.remove(post_id)
+            post["likes"] -= 1
+            delta = -1
+        else:
+            self.liked_posts.add(post_id)
+            post["likes"] += 1
+            delta = 1
+        post["version"] += 1
+        
+        # The like count is shared by every user's ranking
+        self.posts_changed([post])
+        
+        # Liking feeds the current user's author affinity and hashtag interest,
+        # so rescore their posts sharing the author or a hashtag with this one
+        self.author_likes[self.current_user][post["username"]] += delta
+        affected = {p["id"]: p for p in self.posts_by_author[post["username"]]}
+        for tag in self.post_hashtags[post_id]:
+            self.hashtag_interest[self.current_user][tag] += delta
+            affected.update((p["id"], p) for p in self.posts_by_hashtag[tag])
+        self.rescore_posts(list(affected.values()))
+                    
+    def add_comment(self, post_id: int, comment_text: str):
+        """Add a comment to a post"""
+        post = self.post_index.get(post_id)
+        if post is None:
+            return
+        
+        new_comment = {
+            "username": self.current_user,
+            "text": comment_text,
+            "time": "Just now"
+        }
+        post["comments"].append(new_comment)
+        post["version"] += 1
+        self.posts_changed([post])
+                
+    def follow_user(self, username: str):
+        """Follow or unfollow a user"""
+        if username in self.following:
+            self.following.remove(username)
+            self.users[username]["followers"] -= 1
+        else:
+            self.following.add(username)
+            self.users[username]["followers"] += 1
+        self.rescore_posts(self.posts_by_author[username])
+            
+    def create_post(self, image: str, caption: str, location: str = ""):
+        """Create a new post"""
+        new_post = {
+            "id": len(self.posts) + 1,
+            "username": self.current_user,
+            "image": image,
+            "caption": caption,
+            "likes": 0,
+            "comments": [],
+            "time": "Just now",
+            "location": location,
+            "version": 0,
+            "created_at": time.time()
+        }
+        self.posts.insert(0, new_post)
+        self.users[self.current_user]["posts"] += 1
+        self.index_post(new_post)
+        self.posts_changed([new_post])
+
+    def compact(self):
+        """Drop the render cache and ranking state; both are rebuilt on the next read"""
+        self.post_html_cache.clear()
+        self.post_scores.clear()
+        self.feed_members.clear()
+        self.feed_heaps.clear()
+        self.dirty_posts.clear()
+        self.stale_feeds.clear()
+
+    def to_delta(self) -> Dict:
+        """Changes made on top of the seed data, as JSON-serializable data"""
+        seed = InstagramApp()
+        new_posts = [post for post in self.posts if post["id"] not in seed.post_index]
+        return {
+            "current_user": self.current_user,
+            "liked_posts": sorted(self.liked_posts),
+            "toggled_follows": sorted(self.following ^ seed.following),
+            # Oldest first, so replaying them keeps the feed order. The user's
+            # own likes are left out of the counts; they are replayed below.
+            "new_posts": [
+                dict({key: value for key, value in post.items() if key != "version"},
+                     likes=post["likes"] - (post["id"] in self.liked_posts))
+                for post in reversed(new_posts)
+            ],
+            "new_comments": {
+                str(post_id): self.post_index[post_id]["comments"][len(seed_post["comments"]):]
+                for post_id, seed_post in seed.post_index.items()
+                if len(self.post_index[post_id]["comments"]) > len(seed_post["comments"])
+            },
+            "created_at": {str(post_id): self.post_index[post_id]["created_at"] for post_id in seed.post_index}
+        }
+
+    @classmethod
+    def from_delta(cls, delta: Dict) -> 'InstagramApp':
+        """Rebuild an app from the seed data and a delta from to_delta()"""
+        app = cls()
+        for post_id, created_at in delta["created_at"].items():
+            app.post_index[int(post_id)]["created_at"] = created_at
+        for post_id, comments in delta["new_comments"].items():
+            app.post_index[int(post_id)]["comments"].extend(comments)
+        for post in delta["new_posts"]:
+            post = dict(post, version=0)
+            app.posts.insert(0, post)
+            app.users[post["username"]]["posts"] += 1
+            app.index_post(post)
+        app.current_user = delta["current_user"]
+        for username in delta["toggled_follows"]:
+            app.follow_user(username)
+        for post_id in delta["liked_posts"]:
+            app.like_post(post_id)
+        return app
+
+    def search_users(self, query: str) -> List[tuple]:
+        """Find users whose username or name contains the query"""
+        query = query.strip().lower()
+        if not query:
+            return list(self.users.items())
+        return [
+            (username, user_data) for username, user_data in self.users.items()
+            if query in username.lower() or query in user_data["name"].lower()
+        ]
+
+    def render_post_html(self, post: Dict) -> str:
+        """Build the static HTML of a post card, cached by post version"""
+        cached = self.post_html_cache.get(post["id"])
+        if cached and cached[0] == post["version"]:
+            return cached[1]
+        
+        author = self.users[post['username']]
+        parts = [
+            f"<div><b>{author['profile_pic']} {html.escape(author['name'])}</b></div>"
+        ]
+        if post.get('location'):
+            parts.append(f"<div>📍 {html.escape(post['location'])}</div>")
+        parts.append(f"<h2 style='text-align: center; font-size: 48px;'>{post['image']}</h2>")
+        parts.append(f"<p><b>{post['likes']} likes</b></p>")
+        parts.append(f"<p><b>{html.escape(author['name'])}</b> {html.escape(post['caption'])}</p>")
+        
+        # Comments
+        if post['comments']:
+            parts.append("<p><b>Comments:</b></p>")
+            for comment in post['comments'][:3]:  # Show first 3 comments
+                commenter = self.users[comment['username']]['name']
+                parts.append(f"<div><b>{html.escape(commenter)}</b> {html.escape(comment['text'])}</div>")
+            if len(post['comments']) > 3:
+                parts.append(f"<div>View all {len(post['comments'])} comments</div>")
+        
+        post_html = "\n".join(parts)
+        self.post_html_cache[post["id"]] = (post["version"], post_html)
+        return post_html
@@ -0,0 +1,275 @@
+"""Headless load generator for InstagramApp.
+
+Simulated users drive likes, comments, follows, new posts and feed/search
+reads against one shared app, from a thread pool or from asyncio tasks.
+Every operation runs under a single app lock, which is how a shared
+deployment would have to guard the (unsynchronized) app state. In asyncio
+mode the operations run on worker threads via asyncio.to_thread, so tasks
+really wait on each other for the lock.
+
+Example:
+    python instagram_loadtest.py --users 2000 --posts 20000 --workers 16 --ops 500
+    python instagram_loadtest.py --mode asyncio --mix like=70,feed=30
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from instagram_app import InstagramApp
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+DEFAULT_MIX = {"like": 40, "comment": 10, "follow": 5, "post": 5, "feed": 30, "search": 10}
+
+IMAGES = ["🌅", "🍕", "💪", "🎨", "🏖️", "🍔", "🏃‍♂️", "🎭", "🌺", "🏔️"]
+HASHTAGS = ["sunset", "beach", "food", "pizza", "fitness", "art", "travel", "music", "nature", "coffee"]
+
+def build_app(n_users: int, n_posts: int, follow_density: float, seed: int = 0) -> InstagramApp:
+    """Create an app populated with synthetic users, posts and follows"""
+    rng = random.Random(seed)
+    app = InstagramApp()
+
+    for i in range(n_users):
+        app.users[f"user_{i}"] = {
+            "name": f"User {i}",
+            "bio": "Load test account",
+            "followers": 0,
+            "following": 0,
+            "posts": 0,
+            "profile_pic": "👤"
+        }
+    usernames = list(app.users)
+
+    now = time.time()
+    for _ in range(n_posts):
+        username = rng.choice(usernames)
+        tags = " ".join(f"#{tag}" for tag in rng.sample(HASHTAGS, 2))
+        age = rng.randint(0, 72 * 3600)
+        post = {
+            "id": len(app.posts) + 1,
+            "username": username,
+            "image": rng.choice(IMAGES),
+            "caption": f"Generated post {tags}",
+            "likes": rng.randint(0, 500),
+            "comments": [],
+            "time": f"{age // 3600}h ago",
+            "location": "",
+            "version": 0,
+            "created_at": now - age
+        }
+        app.posts.append(post)
+        app.index_post(post)
+        app.users[username]["posts"] += 1
+
+    # Sessions act as any user, so every user follows others at the requested density
+    n_follows = int(follow_density * (len(usernames) - 1))
+    for username in usernames:
+        follows = [other for other in rng.sample(usernames, n_follows + 1) if other != username]
+        app.follows_by_user[username] = set(follows[:n_follows])
+    return app
+
+def make_operations(app: InstagramApp) -> Dict[str, Callable[[random.Random], None]]:
+    """Build the operation table used by the workers"""
+    usernames = list(app.users)
+
+    def like(rng):
+        app.like_post(rng.randint(1, len(app.posts)))
+
+    def comment(rng):
+        app.add_comment(rng.randint(1, len(app.posts)), "Load test comment")
+
+    def follow(rng):
+        username = rng.choice(usernames)
+        if username != app.current_user:
+            app.follow_user(username)
+
+    def post(rng):
+        app.create_post(rng.choice(IMAGES), f"New post #{rng.choice(HASHTAGS)}")
+
+    def feed(rng):
+        app.get_ranked_feed()
+
+    def search(rng):
+        app.search_users(rng.choice(usernames)[:6])
+
+    return {"like": like, "comment": comment, "follow": follow, "post": post, "feed": feed, "search": search}
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """Parse an operation mix like 'like=40,feed=60'"""
+    mix = {}
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation: {name}")
+        mix[name] = int(weight)
+    return mix
+
+def current_rss_kb() -> Optional[int]:
+    """Resident set size of this process right now, where the OS exposes it"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss_kb() -> Optional[int]:
+    """Highest resident set size this process has reached"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # Bytes on macOS, KB elsewhere
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+def run_threads(app, operations, mix, sessions, ops_per_session, workers, seed):
+    """Run every simulated session on a thread pool"""
+    lock = threading.Lock()
+    names, weights = list(mix), list(mix.values())
+    usernames = list(app.users)
+
+    def session(index):
+        rng = random.Random(seed + index)
+        user = rng.choice(usernames)
+        samples = []
+        for name in rng.choices(names, weights, k=ops_per_session):
+            start = time.perf_counter()
+            with lock:
+                acquired = time.perf_counter()
+                app.current_user = user
+                operations[name](rng)
+            samples.append((name, time.perf_counter() - start, acquired - start))
+        return samples
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return [sample for samples in pool.map(session, range(sessions)) for sample in samples]
+
+def run_asyncio(app, operations, mix, sessions, ops_per_session, seed):
+    """Run every simulated session as an asyncio task on one event loop"""
+    names, weights = list(mix), list(mix.values())
+    usernames = list(app.users)
+
+    async def session(index, lock):
+        rng = random.Random(seed + index)
+        user = rng.choice(usernames)
+        samples = []
+        for name in rng.choices(names, weights, k=ops_per_session):
+            start = time.perf_counter()
+            async with lock:
+                acquired = time.perf_counter()
+                app.current_user = user
+                # Off the event loop, so other tasks keep running and queue on the lock
+                await asyncio.to_thread(operations[name], rng)
+            samples.append((name, time.perf_counter() - start, acquired - start))
+        return samples
+
+    async def main():
+        lock = asyncio.Lock()
+        results = await asyncio.gather(*(session(i, lock) for i in range(sessions)))
+        return [sample for samples in results for sample in samples]
+
+    return asyncio.run(main())
+
+def run_load_test(users=1000, posts=10000, follow_density=0.05, sessions=32, ops_per_session=200,
+                  workers=8, mode="threads", mix=None, seed=0, trace_memory=False) -> Dict:
+    """Run one load test and return per-operation and overall statistics"""
+    mix = mix or DEFAULT_MIX
+    app = build_app(users, posts, follow_density, seed)
+    operations = make_operations(app)
+
+    if trace_memory:
+        tracemalloc.start()
+    rss_before = current_rss_kb()
+
+    start = time.perf_counter()
+    if mode == "asyncio":
+        samples = run_asyncio(app, operations, mix, sessions, ops_per_session, seed)
+    else:
+        samples = run_threads(app, operations, mix, sessions, ops_per_session, workers, seed)
+    elapsed = time.perf_counter() - start
+
+    memory = {}
+    rss_after = current_rss_kb()
+    if rss_before is not None and rss_after is not None:
+        memory["rss_growth_kb"] = rss_after - rss_before
+    if peak_rss_kb() is not None:
+        memory["peak_rss_kb"] = peak_rss_kb()
+    if trace_memory:
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        memory.update(traced_growth_kb=current // 1024, traced_peak_kb=peak // 1024)
+
+    latencies = defaultdict(list)
+    waits = defaultdict(list)
+    for name, latency, wait in samples:
+        latencies[name].append(latency)
+        waits[name].append(wait)
+
+    per_operation = {}
+    for name in sorted(latencies):
+        values = sorted(latencies[name])
+        per_operation[name] = {
+            "count": len(values),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "lock_wait_mean_ms": sum(waits[name]) / len(values) * 1000,
+            "lock_wait_share": sum(waits[name]) / sum(values) if sum(values) else 0.0
+        }
+
+    return {
+        "mode": mode,
+        "operations": len(samples),
+        "elapsed_s": elapsed,
+        "throughput_ops": len(samples) / elapsed if elapsed else 0.0,
+        "memory": memory,
+        "per_operation": per_operation
+    }
+
+def print_report(result: Dict):
+    """Print a load test result as a table"""
+    print(f"Mode: {result['mode']}  Operations: {result['operations']}  "
+          f"Elapsed: {result['elapsed_s']:.2f}s  Throughput: {result['throughput_ops']:.0f} ops/s")
+    print("Memory: " + ", ".join(f"{key}={value}" for key, value in result["memory"].items()))
+    print(f"{'operation':<10}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'wait ms':>10}{'wait %':>8}")
+    for name, stats in result["per_operation"].items():
+        print(f"{name:<10}{stats['count']:>8}{stats['p50_ms']:>10.3f}{stats['p95_ms']:>10.3f}"
+              f"{stats['p99_ms']:>10.3f}{stats['lock_wait_mean_ms']:>10.3f}{stats['lock_wait_share'] * 100:>7.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test InstagramApp with simulated users")
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--follow-density", type=float, default=0.05)
+    parser.add_argument("--sessions", type=int, default=32, help="Simulated concurrent users")
+    parser.add_argument("--ops", type=int, default=200, help="Operations per session")
+    parser.add_argument("--workers", type=int, default=8, help="Thread pool size in threads mode")
+    parser.add_argument("--mode", choices=["threads", "asyncio"], default="threads")
+    parser.add_argument("--mix", type=parse_mix, default=None, help="e.g. like=40,comment=10,feed=50")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--trace-memory", action="store_true", help="Track Python heap growth with tracemalloc")
+    args = parser.parse_args()
+
+    result = run_load_test(args.users, args.posts, args.follow_density, args.sessions, args.ops,
+                           args.workers, args.mode, args.mix, args.seed, args.trace_memory)
+    print_report(result)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,347 @@
+"""Session-state footprint profiling and idle-state eviction.
+
+Every page calls SessionRegistry.track() at the start of its run. The
+registry remembers each session's state and when it was last active. It
+then supports:
+
+- profiling: deep size of every key of every session, per-key totals and
+  the largest sessions
+- compaction: after compact_after seconds idle, derived keys (caches the
+  page rebuilds on demand) are dropped and registered compactors run on
+  their values, e.g. InstagramApp.compact()
+- eviction: after evict_after seconds idle, keys with a registered codec are
+  encoded to JSON in a per-session directory of the disk store and removed
+  from memory. The next run of that session restores them in track(),
+  before the page reads them. Sessions the runtime no longer reports as
+  active are forgotten once they pass the eviction age.
+
+Compaction and eviction change a session's state from outside its script
+run, so they happen on the runtime's event loop and only for sessions with
+no script run in progress; the session applying the policies is skipped.
+
+    session_store/<process id>/<session id>/<key>.json
+
+Pages register how their state is handled, e.g.:
+
+    sessions.register_codec("chess_game", ChessGame.to_snapshot, ChessGame.from_snapshot)
+    sessions.track("task3.py")
+
+Fragments and widget callbacks outlive the run that created them, and with
+them the page's globals. Pages that use them keep a SessionValue in their
+globals instead of the evictable value itself, so eviction really releases it:
+
+    app = sessions.value("instagram_app", "task4.py")
+"""
+import asyncio
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import types
+import weakref
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'session_store')
+COMPACT_AFTER_SECONDS = 5 * 60
+EVICT_AFTER_SECONDS = 30 * 60
+POLICY_INTERVAL_SECONDS = 60
+# Lower thresholds would compact and evict sessions between two clicks
+MIN_COMPACT_AFTER_SECONDS = 30
+MIN_EVICT_AFTER_SECONDS = 60
+
+SKIPPED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
+
+def deep_size(obj) -> int:
+    """Bytes held by an object and everything it references (each object counted once)"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, SKIPPED_TYPES):
+            continue
+        seen.add(id(item))
+        # NumPy arrays report their data buffer in __sizeof__ when they own it
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        if hasattr(item, '__dict__') and not isinstance(item, type):
+            stack.append(vars(item))
+        for slot in getattr(type(item), '__slots__', ()):
+            if hasattr(item, slot):
+                stack.append(getattr(item, slot))
+    return total
+
+class TrackedSession:
+    def __init__(self, state):
+        self.state = state
+        self.page = None
+        self.last_seen = time.monotonic()
+        self.compacted = False
+        self.evicted = set()
+        self.evicted_refs = {}  # key -> weakref to the evicted value, if supported
+
+class SessionRegistry:
+    """Process-wide view of every session's state, with compaction and eviction"""
+
+    def __init__(self, store_dir: Optional[str] = None, compact_after: float = COMPACT_AFTER_SECONDS,
+                 evict_after: float = EVICT_AFTER_SECONDS):
+        # One directory per process, so processes sharing the checkout don't
+        # remove each other's stored state
+        self.store_dir = store_dir or os.path.join(STORE_DIR, str(os.getpid()))
+        self.compact_after = compact_after
+        self.evict_after = evict_after
+        self.sessions: Dict[str, TrackedSession] = {}
+        self.codecs: Dict[str, tuple] = {}
+        self.compactors: Dict[str, Callable] = {}
+        self.derived = set()
+        self.last_policy_run = None
+        self._lock = threading.RLock()
+        self._thread = None
+        self._stop = threading.Event()
+        # Session ids don't survive a restart, so anything stored is unreachable
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+    # Registration (called by pages on every run)
+
+    def register_codec(self, key: str, encode: Callable, decode: Callable):
+        """Allow eviction of a key: encode(value) must return JSON data that decode(data) turns back into the value"""
+        self.codecs[key] = (encode, decode)
+
+    def register_compactor(self, key: str, compact: Callable):
+        """Function that shrinks a value in place when its session goes idle"""
+        self.compactors[key] = compact
+
+    def register_derived(self, *keys: str):
+        """Keys the page can rebuild when missing; they are dropped on compaction"""
+        self.derived.update(keys)
+
+    def track(self, page: str):
+        """Mark the current session active and restore any of its evicted keys"""
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return  # Bare mode, e.g. python task1.py
+        # The SafeSessionState wrapper is recreated for every run; the
+        # SessionState inside it lives as long as the session
+        state = ctx.session_state._state
+        with self._lock:
+            tracked = self.sessions.get(ctx.session_id)
+            if tracked is None or tracked.state is not state:
+                tracked = TrackedSession(state)
+                self.sessions[ctx.session_id] = tracked
+            tracked.page = page
+            tracked.last_seen = time.monotonic()
+            tracked.compacted = False
+            for key in list(tracked.evicted):
+                if key in self.codecs:
+                    ctx.session_state[key] = self._restore(ctx.session_id, tracked, key)
+                    tracked.evicted.discard(key)
+
+    def value(self, key: str, page: str) -> 'SessionValue':
+        """Late-bound stand-in for a session-state value that may be evicted"""
+        return SessionValue(self, key, page)
+
+    # Profiling
+
+    def profile(self) -> List[dict]:
+        """Deep size of every key of every live session"""
+        now = time.monotonic()
+        rows = []
+        with self._lock:
+            for session_id, tracked in self.sessions.items():
+                state = tracked.state
+                sizes = {key: deep_size(value) for key, value in state.filtered_state.items()}
+                rows.append({
+                    'session_id': session_id,
+                    'page': tracked.page,
+                    'idle_seconds': now - tracked.last_seen,
+                    'bytes': sum(sizes.values()),
+                    'keys': sizes,
+                    'evicted': sorted(tracked.evicted),
+                    # Evicted values something still references, so eviction freed nothing
+                    'retained': sorted(key for key, ref in tracked.evicted_refs.items() if ref() is not None),
+                    'stored_bytes': self._stored_bytes(session_id)
+                })
+        return rows
+
+    def summary(self, top: int = 10) -> dict:
+        """Totals across sessions, per-key totals and the largest sessions"""
+        rows = self.profile()
+        by_key = {}
+        for row in rows:
+            for key, size in row['keys'].items():
+                by_key[key] = by_key.get(key, 0) + size
+        return {
+            'sessions': len(rows),
+            'idle_sessions': sum(row['idle_seconds'] > self.compact_after for row in rows),
+            'total_bytes': sum(row['bytes'] for row in rows),
+            'stored_bytes': sum(row['stored_bytes'] for row in rows),
+            'bytes_by_key': dict(sorted(by_key.items(), key=lambda item: item[1], reverse=True)),
+            'largest_sessions': sorted(rows, key=lambda row: row['bytes'], reverse=True)[:top],
+            'last_policy_run': self.last_policy_run
+        }
+
+    # Policies
+
+    def apply_policies(self, compact_after: Optional[float] = None, evict_after: Optional[float] = None) -> dict:
+        """Compact and evict idle sessions; forget closed ones"""
+        compact_after = self.compact_after if compact_after is None else compact_after
+        evict_after = self.evict_after if evict_after is None else evict_after
+        now = time.monotonic()
+        ctx = get_script_run_ctx()
+        result = {'compacted_sessions': 0, 'evicted_sessions': 0, 'evicted_keys': 0,
+                  'closed_sessions': 0, 'busy_sessions': 0, 'bytes_freed': 0}
+        with self._lock:
+            for session_id, tracked in list(self.sessions.items()):
+                state = tracked.state
+                idle = now - tracked.last_seen
+                if idle < compact_after or (ctx is not None and session_id == ctx.session_id):
+                    continue
+                if idle >= evict_after and self._closed(session_id):
+                    del self.sessions[session_id]
+                    shutil.rmtree(os.path.join(self.store_dir, session_id), ignore_errors=True)
+                    result['closed_sessions'] += 1
+                    continue
+                evicting = idle >= evict_after and any(key in state for key in self.codecs)
+                if tracked.compacted and not evicting:
+                    continue
+
+                outcome = self._when_idle(session_id, lambda: self._shrink(session_id, tracked, evicting))
+                if outcome is None:
+                    result['busy_sessions'] += 1  # Retried on the next run
+                    continue
+                bytes_freed, evicted = outcome
+                tracked.compacted = True
+                tracked.evicted.update(evicted)
+                result['compacted_sessions'] += 1
+                result['evicted_keys'] += len(evicted)
+                result['evicted_sessions'] += bool(evicted)
+                result['bytes_freed'] += bytes_freed
+        self.last_policy_run = {'at': time.time(), **result}
+        return result
+
+    def start(self, interval: float = POLICY_INTERVAL_SECONDS):
+        """Apply the policies periodically in a background daemon thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, args=(interval,), name="session-memory", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self, interval: float):
+        while not self._stop.wait(interval):
+            self.apply_policies()
+
+    # Internals (called with the lock held)
+
+    def _closed(self, session_id: str) -> bool:
+        # Disconnected sessions are kept by the runtime for a short while in
+        # case the browser reconnects; past the eviction age they are gone
+        return runtime.exists() and not runtime.get_instance().is_active_session(session_id)
+
+    def _when_idle(self, session_id: str, action: Callable):
+        """Result of action, run while the session has no script run, or None if it has one"""
+        if not runtime.exists():
+            return action()  # Bare mode and AppTest: nothing runs concurrently
+        instance = runtime.get_instance()
+
+        async def run_if_idle():
+            # New script runs are only started on the event loop, so none can
+            # begin while this runs. Streamlit has no public API for this
+            info = instance._session_mgr.get_session_info(session_id)
+            if info is not None and info.session._scriptrunner is not None:
+                return None
+            return action()
+
+        return asyncio.run_coroutine_threadsafe(run_if_idle(), instance._get_async_objs().eventloop).result()
+
+    def _shrink(self, session_id: str, tracked: TrackedSession, evicting: bool):
+        state = tracked.state
+        before = sum(deep_size(value) for value in state.filtered_state.values())
+        self._compact(state)
+        evicted = self._evict(session_id, tracked, state) if evicting else []
+        after = sum(deep_size(value) for value in state.filtered_state.values())
+        return before - after, evicted
+
+    def _compact(self, state):
+        for key in self.derived:
+            if key in state:
+                del state[key]
+        for key, compact in self.compactors.items():
+            if key in state:
+                compact(state[key])
+
+    def _evict(self, session_id: str, tracked: TrackedSession, state) -> List[str]:
+        session_dir = os.path.join(self.store_dir, session_id)
+        os.makedirs(session_dir, exist_ok=True)
+        evicted = []
+        for key, (encode, _) in self.codecs.items():
+            if key not in state:
+                continue
+            path = os.path.join(session_dir, f"{key}.json")
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(encode(state[key]), f)
+            os.replace(tmp_path, path)
+            try:
+                tracked.evicted_refs[key] = weakref.ref(state[key])
+            except TypeError:
+                pass
+            del state[key]
+            evicted.append(key)
+        return evicted
+
+    def _restore(self, session_id: str, tracked: TrackedSession, key: str):
+        path = os.path.join(self.store_dir, session_id, f"{key}.json")
+        # A value that is still alive may have changed since it was stored
+        ref = tracked.evicted_refs.pop(key, None)
+        value = ref() if ref is not None else None
+        if value is None:
+            with open(path) as f:
+                _, decode = self.codecs[key]
+                value = decode(json.load(f))
+        os.remove(path)
+        return value
+
+    def _stored_bytes(self, session_id: str) -> int:
+        session_dir = os.path.join(self.store_dir, session_id)
+        if not os.path.isdir(session_dir):
+            return 0
+        return sum(entry.stat().st_size for entry in os.scandir(session_dir) if entry.is_file())
+
+class SessionValue:
+    """Looks up a session-state value on every attribute access, restoring it if it was evicted.
+
+    Methods are bound late as well, so they can be passed as widget callbacks
+    without the callback holding on to the value.
+    """
+
+    def __init__(self, registry: SessionRegistry, key: str, page: str):
+        self._registry = registry
+        self._key = key
+        self._page = page
+
+    def resolve(self):
+        state = get_script_run_ctx().session_state
+        if self._key not in state:
+            self._registry.track(self._page)
+        return state[self._key]
+
+    def __getattr__(self, name):
+        attribute = getattr(self.resolve(), name)
+        if not callable(attribute):
+            return attribute
+        return lambda *args, **kwargs: getattr(self.resolve(), name)(*args, **kwargs)
@@ -0,0 +1,49 @@
+"""Session-state footprint of every session in this process, with manual policy runs"""
+import streamlit as st
+
+from app_resources import get_session_registry
+from session_memory import MIN_COMPACT_AFTER_SECONDS, MIN_EVICT_AFTER_SECONDS
+
+def megabytes(size):
+    return round(size / 2**20, 3)
+
+sessions = get_session_registry()
+sessions.track("sessions_page.py")
+
+st.title("Session Memory")
+
+with st.sidebar:
+    compact_after = st.number_input("Compact after idle (s)", min_value=MIN_COMPACT_AFTER_SECONDS,
+                                    value=int(sessions.compact_after))
+    evict_after = st.number_input("Evict after idle (s)", min_value=max(MIN_EVICT_AFTER_SECONDS, compact_after),
+                                  value=max(int(sessions.evict_after), compact_after))
+    if st.button("Apply policies now"):
+        st.session_state.policy_result = sessions.apply_policies(compact_after, evict_after)
+    if "policy_result" in st.session_state:
+        st.json(st.session_state.policy_result)
+
+summary = sessions.summary()
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("Sessions", summary['sessions'])
+col2.metric("Idle sessions", summary['idle_sessions'])
+col3.metric("In memory (MB)", megabytes(summary['total_bytes']))
+col4.metric("On disk (MB)", megabytes(summary['stored_bytes']))
+
+st.subheader("Memory by key")
+st.dataframe([{'key': key, 'MB': megabytes(size)} for key, size in summary['bytes_by_key'].items()],
+             hide_index=True)
+
+st.subheader("Largest sessions")
+st.dataframe([{
+    'session': row['session_id'][:8],
+    'page': row['page'],
+    'idle (s)': round(row['idle_seconds']),
+    'MB': megabytes(row['bytes']),
+    'largest keys': ", ".join(f"{key} {megabytes(size)}" for key, size
+                              in sorted(row['keys'].items(), key=lambda item: item[1], reverse=True)[:3]),
+    'evicted': ", ".join(row['evicted']),
+    'on disk (MB)': megabytes(row['stored_bytes'])
+} for row in summary['largest_sessions']], hide_index=True)
+
+if summary['last_policy_run']:
+    st.caption(f"Last policy run: {summary['last_policy_run']}")
@@ -0,0 +1,350 @@
+"""Shared multiplayer snake arena.
+
+One Arena per process holds every snake on a single large grid. A single
+background thread advances the game at a fixed tick rate. Sessions only
+queue turns and read updates, so the game state has one authority no matter
+how many browser sessions are connected.
+
+- grid: int32 occupancy array, one code per cell (EMPTY, FOOD or the owning
+  snake's id), so a collision check is a single array lookup no matter how
+  many snakes there are
+- deltas: every tick records the cells it changed. A client passes the last
+  tick it has seen and gets only the newer changes, or a full snapshot if it
+  fell too far behind.
+- bots: optional computer snakes that keep the arena busy and serve as the
+  load for the benchmark
+
+Example:
+    python snake_arena.py --grid-size 200 --bots 500 --seconds 10
+"""
+import argparse
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from snake_game import DIRECTIONS, OPPOSITE
+
+EMPTY = 0
+FOOD = -1
+
+Change = Tuple[int, int, int]
+
+class ArenaSnake:
+    """One player's or bot's snake"""
+
+    def __init__(self, snake_id: int, name: str, bot: bool = False):
+        self.id = snake_id
+        self.name = name
+        self.bot = bot
+        self.body = deque()
+        self.direction = "RIGHT"
+        self.last_move = "RIGHT"
+        self.alive = False
+        self.score = 0
+        self.best_score = 0
+        self.last_seen = time.monotonic()
+
+class Arena:
+    """Authoritative game state shared by all sessions"""
+
+    def __init__(self, grid_size: int = 64, tick_rate: float = 10.0, food_count: Optional[int] = None,
+                 history_ticks: int = 64, idle_seconds: float = 120.0, respawn_bots: bool = True,
+                 seed: Optional[int] = None):
+        self.grid_size = grid_size
+        self.tick_rate = tick_rate
+        self.food_count = food_count or max(1, grid_size * grid_size // 100)
+        self.idle_seconds = idle_seconds
+        self.respawn_bots = respawn_bots
+        self.rng = random.Random(seed)
+        self.grid = np.zeros((grid_size, grid_size), dtype=np.int32)
+        self.snakes: Dict[int, ArenaSnake] = {}
+        self.next_id = 1
+        self.food = set()
+        self.tick_number = 0
+        self.history = deque(maxlen=history_ticks)
+        self.tick_seconds = deque(maxlen=1000)
+        self.overruns = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._spawn_food()
+
+    # Session API
+
+    def join(self, name: str, bot: bool = False) -> int:
+        """Add a snake and spawn it. Returns its id."""
+        with self._lock:
+            snake = ArenaSnake(self.next_id, name, bot)
+            self.next_id += 1
+            self.snakes[snake.id] = snake
+            self._spawn_snake(snake, self._pending_changes())
+            return snake.id
+
+    def leave(self, snake_id: int):
+        with self._lock:
+            snake = self.snakes.pop(snake_id, None)
+            if snake is not None:
+                changes = self._pending_changes()
+                self._clear_body(snake, changes)
+
+    def respawn(self, snake_id: int):
+        with self._lock:
+            snake = self.snakes.get(snake_id)
+            if snake is not None and not snake.alive:
+                self._spawn_snake(snake, self._pending_changes())
+
+    def turn(self, snake_id: int, direction: str):
+        """Queue a direction for the next tick; reversals are ignored"""
+        with self._lock:
+            snake = self.snakes.get(snake_id)
+            if snake is not None:
+                snake.last_seen = time.monotonic()
+                if direction in DIRECTIONS and direction != OPPOSITE[snake.last_move]:
+                    snake.direction = direction
+
+    def updates(self, since_tick: int, snake_id: Optional[int] = None) -> Tuple[int, Optional[np.ndarray], List[Change]]:
+        """Changes after since_tick as (tick, None, changes), or (tick, grid copy, []) if too old"""
+        with self._lock:
+            snake = self.snakes.get(snake_id)
+            if snake is not None:
+                snake.last_seen = time.monotonic()
+            oldest = self.history[0][0] if self.history else self.tick_number + 1
+            if since_tick < 0 or since_tick + 1 < oldest:
+                return self.tick_number, self.grid.copy(), []
+            changes = [change for tick, tick_changes in self.history
+                       if since_tick < tick <= self.tick_number for change in tick_changes]
+            return self.tick_number, None, changes
+
+    def snake_info(self, snake_id: int) -> Optional[dict]:
+        with self._lock:
+            snake = self.snakes.get(snake_id)
+            if snake is None:
+                return None
+            return {'alive': snake.alive, 'score': snake.score, 'best_score': snake.best_score,
+                    'length': len(snake.body), 'head': snake.body[0] if snake.body else None}
+
+    def leaderboard(self, top: int = 10) -> List[dict]:
+        with self._lock:
+            ranked = sorted(self.snakes.values(), key=lambda snake: (snake.score, snake.best_score), reverse=True)
+            return [{'name': snake.name, 'score': snake.score, 'best': snake.best_score, 'alive': snake.alive}
+                    for snake in ranked[:top]]
+
+    def add_bots(self, count: int):
+        for _ in range(count):
+            self.join(f"bot-{self.next_id}", bot=True)
+
+    # Tick loop
+
+    def start(self):
+        """Run the tick loop in a background daemon thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="snake-arena", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        interval = 1.0 / self.tick_rate
+        deadline = time.monotonic()
+        while not self._stop.is_set():
+            start = time.monotonic()
+            self.tick()
+            self.tick_seconds.append(time.monotonic() - start)
+            # Schedule against absolute deadlines so slow ticks don't accumulate drift
+            deadline += interval
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                self.overruns += 1
+                deadline = time.monotonic()
+            else:
+                self._stop.wait(delay)
+
+    def tick(self):
+        """Advance every live snake one cell"""
+        with self._lock:
+            self.tick_number += 1
+            changes = self._changes_for(self.tick_number)
+            live = [snake for snake in self.snakes.values() if snake.alive]
+
+            new_heads = {}
+            arrivals = {}
+            for snake in live:
+                if snake.bot:
+                    self._steer_bot(snake)
+                dx, dy = DIRECTIONS[snake.direction]
+                head_x, head_y = snake.body[0]
+                head = (head_x + dx, head_y + dy)
+                snake.last_move = snake.direction
+                new_heads[snake.id] = head
+                arrivals[head] = arrivals.get(head, 0) + 1
+
+            # Collisions are checked against the grid before anyone moves, like SnakeGame
+            crashed = []
+            for snake in live:
+                head = new_heads[snake.id]
+                x, y = head
+                if (not (0 <= x < self.grid_size and 0 <= y < self.grid_size) or self.grid[y, x] > 0
+                        or arrivals[head] > 1):
+                    crashed.append(snake)
+            for snake in crashed:
+                snake.alive = False
+                snake.best_score = max(snake.best_score, snake.score)
+                self._clear_body(snake, changes)
+
+            for snake in live:
+                if not snake.alive:
+                    continue
+                head = new_heads[snake.id]
+                ate = head in self.food
+                snake.body.appendleft(head)
+                self._set(head, snake.id, changes)
+                if ate:
+                    self.food.discard(head)
+                    snake.score += 1
+                else:
+                    self._set(snake.body.pop(), EMPTY, changes)
+
+            if self.respawn_bots:
+                for snake in self.snakes.values():
+                    if snake.bot and not snake.alive:
+                        self._spawn_snake(snake, changes)
+            self._spawn_food(changes)
+            if self.tick_number % int(self.tick_rate * 10 or 1) == 0:
+                self._drop_idle(changes)
+
+    # Internals (called with the lock held)
+
+    def _changes_for(self, tick: int) -> List[Change]:
+        if not self.history or self.history[-1][0] != tick:
+            self.history.append((tick, []))
+        return self.history[-1][1]
+
+    def _pending_changes(self) -> List[Change]:
+        """Change list for updates made between ticks; clients see them with the next tick"""
+        return self._changes_for(self.tick_number + 1)
+
+    def _set(self, cell, value: int, changes: List[Change]):
+        x, y = cell
+        self.grid[y, x] = value
+        changes.append((x, y, value))
+
+    def _clear_body(self, snake: ArenaSnake, changes: List[Change]):
+        for cell in snake.body:
+            self._set(cell, EMPTY, changes)
+        snake.body.clear()
+
+    def _random_empty_cell(self, attempts: int = 32):
+        # The arena is mostly empty, so random probing almost always hits quickly
+        for _ in range(attempts):
+            x = self.rng.randrange(self.grid_size)
+            y = self.rng.randrange(self.grid_size)
+            if self.grid[y, x] == EMPTY:
+                return (x, y)
+        empty = np.flatnonzero(self.grid == EMPTY)
+        if len(empty) == 0:
+            return None
+        index = int(empty[self.rng.randrange(len(empty))])
+        return (index % self.grid_size, index // self.grid_size)
+
+    def _spawn_snake(self, snake: ArenaSnake, changes: List[Change]):
+        for _ in range(64):
+            cell = self._random_empty_cell()
+            if cell is None:
+                return
+            # Face a direction with a few free cells ahead
+            directions = list(DIRECTIONS)
+            self.rng.shuffle(directions)
+            for direction in directions:
+                dx, dy = DIRECTIONS[direction]
+                ahead = [(cell[0] + dx * i, cell[1] + dy * i) for i in range(1, 4)]
+                if all(0 <= x < self.grid_size and 0 <= y < self.grid_size and self.grid[y, x] <= 0 for x, y in ahead):
+                    snake.body = deque([cell])
+                    snake.direction = snake.last_move = direction
+                    snake.alive = True
+                    snake.score = 0
+                    self.food.discard(cell)
+                    self._set(cell, snake.id, changes)
+                    return
+
+    def _spawn_food(self, changes: Optional[List[Change]] = None):
+        changes = self._pending_changes() if changes is None else changes
+        while len(self.food) < self.food_count:
+            cell = self._random_empty_cell()
+            if cell is None:
+                return
+            self.food.add(cell)
+            self._set(cell, FOOD, changes)
+
+    def _steer_bot(self, snake: ArenaSnake):
+        """Head for nearby food, otherwise keep going; never pick a blocked cell if avoidable"""
+        head_x, head_y = snake.body[0]
+        options = []
+        for direction, (dx, dy) in DIRECTIONS.items():
+            if direction == OPPOSITE[snake.last_move]:
+                continue
+            x, y = head_x + dx, head_y + dy
+            if 0 <= x < self.grid_size and 0 <= y < self.grid_size and self.grid[y, x] <= 0:
+                food_bonus = 2 if self.grid[y, x] == FOOD else 0
+                options.append((food_bonus + (direction == snake.direction) + self.rng.random(), direction))
+        if options:
+            snake.direction = max(options)[1]
+
+    def _drop_idle(self, changes: List[Change]):
+        """Remove player snakes whose session stopped polling"""
+        cutoff = time.monotonic() - self.idle_seconds
+        for snake_id in [snake.id for snake in self.snakes.values() if not snake.bot and snake.last_seen < cutoff]:
+            self._clear_body(self.snakes.pop(snake_id), changes)
+
+    def stats(self) -> dict:
+        with self._lock:
+            durations = sorted(self.tick_seconds)
+            return {
+                'tick': self.tick_number,
+                'snakes': len(self.snakes),
+                'alive': sum(snake.alive for snake in self.snakes.values()),
+                'tick_mean_ms': sum(durations) / len(durations) * 1000 if durations else 0.0,
+                'tick_p99_ms': durations[int(len(durations) * 0.99)] * 1000 if durations else 0.0,
+                'tick_max_ms': durations[-1] * 1000 if durations else 0.0,
+                'overruns': self.overruns
+            }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the snake arena with bots and report tick latency")
+    parser.add_argument("--grid-size", type=int, default=200)
+    parser.add_argument("--bots", type=int, default=500)
+    parser.add_argument("--tick-rate", type=float, default=10.0)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    arena = Arena(args.grid_size, args.tick_rate, seed=0)
+    arena.add_bots(args.bots)
+    arena.start()
+    # Simulated clients: each polls for deltas once per tick, as a browser session would
+    client_ticks = [0] * min(args.bots, 100)
+    changes_received = 0
+    end = time.monotonic() + args.seconds
+    while time.monotonic() < end:
+        time.sleep(1.0 / args.tick_rate)
+        for i, since in enumerate(client_ticks):
+            tick, _, changes = arena.updates(since)
+            client_ticks[i] = tick
+            changes_received += len(changes)
+    arena.stop()
+
+    stats = arena.stats()
+    print(f"{stats['tick']} ticks, {stats['snakes']} snakes ({stats['alive']} alive) on {args.grid_size}x{args.grid_size}")
+    print(f"tick mean {stats['tick_mean_ms']:.2f} ms, p99 {stats['tick_p99_ms']:.2f} ms, "
+          f"max {stats['tick_max_ms']:.2f} ms, overruns {stats['overruns']}")
+    print(f"{len(client_ticks)} clients received {changes_received:,} cell changes "
+          f"(a full redraw every tick would be {stats['tick'] * len(client_ticks) * args.grid_size ** 2:,})")
+
+if __name__ == "__main__":
+    main()
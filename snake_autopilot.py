@@ -0,0 +1,303 @@
+"""Pathfinding autopilot for SnakeGame.
+
+Even boards have a Hamiltonian cycle. While the body runs forward along it
+from tail to head, every empty cell lies ahead of the head in cycle order,
+and moves that stay short of the tail can never trap the snake. Shortcuts
+toward the food are allowed only while the body spans at most half the
+cycle, so the board can always be completed.
+
+Small even boards: A* toward the food over such moves only. The path is
+reused move by move until the food changes.
+
+Large even boards (grid_size >= cycle_grid_size): take the furthest allowed
+move toward the food without searching. Each decision only checks that the
+body still lies along the cycle, O(length).
+
+Odd boards, and bodies that don't lie along the cycle (e.g. after manual
+play): A* toward the food where body cells count as free once they will have
+been vacated by the time the head gets there. A new path is only used if,
+after following it and eating, the snake can still reach its own tail.
+Without a safe path the snake takes the move that keeps its tail reachable
+and leaves it the most room (flood fill). Food spawning on the only way
+back to the tail can still trap it.
+
+Example:
+    python snake_autopilot.py --grid-sizes 10 20 30 --seeds 20
+"""
+import argparse
+import heapq
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from snake_game import DIRECTIONS, OPPOSITE, SnakeGame
+
+Cell = Tuple[int, int]
+
+DIRECTION_OF_DELTA = {delta: direction for direction, delta in DIRECTIONS.items()}
+
+def hamiltonian_cycle(grid_size: int) -> Optional[List[Cell]]:
+    """Cells of a Hamiltonian cycle on an even-sized grid, or None for odd sizes.
+
+    Row 0 runs left to right, the remaining columns 1.. are swept row by row,
+    and column 0 leads back up to the start.
+    """
+    if grid_size % 2 or grid_size < 2:
+        return None
+    cycle = [(x, 0) for x in range(grid_size)]
+    for y in range(1, grid_size):
+        xs = range(grid_size - 1, 0, -1) if y % 2 else range(1, grid_size)
+        cycle.extend((x, y) for x in xs)
+    cycle.extend((0, y) for y in range(grid_size - 1, 0, -1))
+    return cycle
+
+@lru_cache(maxsize=8)
+def grid_neighbors(grid_size: int) -> Dict[Cell, Tuple[Cell, ...]]:
+    """In-bounds neighbors of every cell, so searches skip the bounds checks"""
+    return {
+        (x, y): tuple((x + dx, y + dy) for dx, dy in DIRECTIONS.values()
+                      if 0 <= x + dx < grid_size and 0 <= y + dy < grid_size)
+        for y in range(grid_size) for x in range(grid_size)
+    }
+
+def body_life(body) -> Dict[Cell, int]:
+    """Moves until each body cell is vacated (tail 1, head len(body))"""
+    length = len(body)
+    return {cell: length - i for i, cell in enumerate(body)}
+
+def flood_fill(body, grid_size: int, goal: Optional[Cell] = None) -> Tuple[int, bool]:
+    """Cells reachable from the head as the body moves away, and whether goal is among them"""
+    life = body_life(body)
+    neighbors = grid_neighbors(grid_size)
+    head = body[0]
+    seen = {head}
+    frontier = [head]
+    steps = 0
+    found = False
+    while frontier:
+        steps += 1
+        next_frontier = []
+        for current in frontier:
+            for cell in neighbors[current]:
+                if cell in seen or life.get(cell, 0) >= steps:
+                    continue
+                found = found or cell == goal
+                seen.add(cell)
+                next_frontier.append(cell)
+        frontier = next_frontier
+    return len(seen) - 1, found
+
+def tail_reachable(body, grid_size: int) -> bool:
+    return len(body) == 1 or flood_fill(body, grid_size, body[-1])[1]
+
+def cycle_ordered(body, order: Dict[Cell, int]) -> bool:
+    """Whether the body runs forward along the cycle from tail to head"""
+    cells = len(order)
+    tail = order[body[-1]]
+    previous = 0
+    for i in range(len(body) - 2, -1, -1):
+        distance = (order[body[i]] - tail) % cells
+        if distance <= previous:
+            return False
+        previous = distance
+    return True
+
+class Autopilot:
+    """Chooses the next direction for a SnakeGame"""
+
+    def __init__(self, cycle_grid_size: int = 30, max_expansions: Optional[int] = None):
+        self.cycle_grid_size = cycle_grid_size
+        self.max_expansions = max_expansions
+        self.path = deque()
+        self.path_food = None
+        self.cycle_grid = None
+        self.cycle_order = None
+        self.replans = 0
+
+    def legal_moves(self, game: SnakeGame):
+        """(direction, cell) pairs that don't collide and aren't a reversal"""
+        moves = []
+        for direction in DIRECTIONS:
+            if direction == OPPOSITE[game.last_move]:
+                continue
+            cell = game.next_head(direction)
+            if not game.is_collision(cell):
+                moves.append((direction, cell))
+        return moves
+
+    def cycle(self, grid_size: int) -> Optional[Dict[Cell, int]]:
+        """Position of every cell on the Hamiltonian cycle, or None for odd sizes"""
+        if self.cycle_grid != grid_size:
+            self.cycle_grid = grid_size
+            cycle = hamiltonian_cycle(grid_size)
+            self.cycle_order = {cell: i for i, cell in enumerate(cycle)} if cycle else None
+        return self.cycle_order
+
+    def choose(self, game: SnakeGame) -> str:
+        order = self.cycle(game.grid_size)
+        # Play before the autopilot took over may have left the body off the cycle
+        if order is not None and game.grid_size >= self.cycle_grid_size and cycle_ordered(game.snake, order):
+            return self.choose_on_cycle(game)
+
+        # Reuse the planned path while it still leads to the current food
+        if self.path and self.path_food == game.food:
+            head_x, head_y = game.head
+            cell = self.path[0]
+            direction = DIRECTION_OF_DELTA.get((cell[0] - head_x, cell[1] - head_y))
+            if direction is not None and direction != OPPOSITE[game.last_move] and not game.is_collision(cell):
+                self.path.popleft()
+                return direction
+
+        self.path.clear()
+        self.path_food = None
+        if order is not None and not cycle_ordered(game.snake, order):
+            order = None
+        if game.food is not None:
+            self.replans += 1
+            path = self.find_path(game, order)
+            # Paths along the cycle are safe by construction
+            if path is not None and (order is not None or self.is_safe(game, path)):
+                self.path = deque(path)
+                self.path_food = game.food
+                return self.choose(game)
+        return self.choose_on_cycle(game) if order is not None else self.choose_fallback(game)
+
+    def find_path(self, game: SnakeGame, order: Optional[Dict[Cell, int]] = None) -> Optional[List[Cell]]:
+        """A* from the head to the food, or None. With a cycle order, only over moves choose_on_cycle allows."""
+        life = body_life(game.snake)
+        neighbors = grid_neighbors(game.grid_size)
+        head, goal = game.head, game.food
+        reverse = game.next_head(OPPOSITE[game.last_move])
+        max_expansions = self.max_expansions or game.grid_size ** 2
+        if order is not None:
+            cells = len(order)
+            start = order[head]
+            # The tail only moves forward, so its current position is a safe bound
+            tail_distance = (order[game.snake[-1]] - start) % cells if len(game.snake) > 1 else cells
+        heap = [(abs(head[0] - goal[0]) + abs(head[1] - goal[1]), 0, head)]
+        parents = {head: None}
+        expansions = 0
+        while heap and expansions < max_expansions:
+            _, steps, cell = heapq.heappop(heap)
+            if cell == goal:
+                path = []
+                while cell != head:
+                    path.append(cell)
+                    cell = parents[cell]
+                return path[::-1]
+            expansions += 1
+            if order is not None:
+                cell_distance = (order[cell] - start) % cells
+            for neighbor in neighbors[cell]:
+                if neighbor in parents or life.get(neighbor, 0) > steps or (steps == 0 and neighbor == reverse):
+                    continue
+                if order is not None:
+                    distance = (order[neighbor] - start) % cells
+                    if not cell_distance < distance < tail_distance:
+                        continue
+                    if distance - cell_distance > 1 and tail_distance - distance <= cells // 2:
+                        continue
+                parents[neighbor] = cell
+                estimate = steps + 1 + abs(neighbor[0] - goal[0]) + abs(neighbor[1] - goal[1])
+                heapq.heappush(heap, (estimate, steps + 1, neighbor))
+        return None
+
+    def is_safe(self, game: SnakeGame, path: List[Cell]) -> bool:
+        """Whether the snake can still reach its tail after following path and eating"""
+        body_after = (path[::-1] + list(game.snake))[:len(game.snake) + 1]
+        return tail_reachable(body_after, game.grid_size)
+
+    def choose_fallback(self, game: SnakeGame) -> str:
+        """Move that keeps the tail reachable and leaves the most room"""
+        best, best_key = game.direction, None
+        for direction, cell in self.legal_moves(game):
+            body_after = [cell] + list(game.snake)
+            if cell != game.food:
+                body_after.pop()
+            area, reaches_tail = flood_fill(body_after, game.grid_size, body_after[-1])
+            key = (reaches_tail or len(body_after) == 1, area)
+            if best_key is None or key > best_key:
+                best, best_key = direction, key
+        return best
+
+    def choose_on_cycle(self, game: SnakeGame) -> str:
+        """Next move along the Hamiltonian cycle, shortcutting toward food when safe"""
+        order = self.cycle(game.grid_size)
+        cells = len(order)
+        head = order[game.head]
+
+        # The body always lies between tail and head in cycle order, so any move
+        # that stays short of the tail lands on an empty stretch of the cycle.
+        # Shortcuts leave empty gaps inside the body's stretch; moving into the
+        # tail cell is a collision, so gaps left at the end would strand the
+        # head. Shortcuts are therefore only taken while the body spans at most
+        # half the cycle, which gives the gaps time to drain before the end game.
+        tail_distance = (order[game.snake[-1]] - head) % cells if len(game.snake) > 1 else cells
+        food_distance = (order[game.food] - head) % cells if game.food is not None else cells
+        best, best_distance = None, 0
+        fallback, fallback_distance = game.direction, cells
+        for direction, cell in self.legal_moves(game):
+            distance = (order[cell] - head) % cells
+            if distance < fallback_distance:
+                fallback, fallback_distance = direction, distance
+            allowed = distance == 1 or tail_distance - distance > cells // 2
+            if allowed and distance < tail_distance and distance <= food_distance and distance > best_distance:
+                best, best_distance = direction, distance
+        return best or fallback
+
+def play(grid_size: int, seed: int, autopilot: Optional[Autopilot] = None,
+         stall_moves: Optional[int] = None) -> dict:
+    """Play one game to the end. Gives up after stall_moves moves without food."""
+    game = SnakeGame(grid_size, seed=seed)
+    autopilot = autopilot or Autopilot()
+    stall_moves = stall_moves or 4 * grid_size ** 2
+    moves = since_food = 0
+    decision_seconds = 0.0
+    max_decision = 0.0
+    while not game.game_over and since_food < stall_moves:
+        start = time.perf_counter()
+        game.turn(autopilot.choose(game))
+        elapsed = time.perf_counter() - start
+        decision_seconds += elapsed
+        max_decision = max(max_decision, elapsed)
+        since_food = 0 if game.step() else since_food + 1
+        moves += 1
+    return {'score': game.score, 'moves': moves, 'won': game.food is None, 'died': game.game_over and game.food is not None,
+            'decision_seconds': decision_seconds, 'max_decision_seconds': max_decision}
+
+def benchmark(grid_sizes: List[int], seeds: int, cycle_grid_size: int = 30) -> List[dict]:
+    """Autopilot over many seeds per grid size: moves per second, average score, deaths and completion rate"""
+    results = []
+    for grid_size in grid_sizes:
+        games = [play(grid_size, seed, Autopilot(cycle_grid_size)) for seed in range(seeds)]
+        moves = sum(game['moves'] for game in games)
+        seconds = sum(game['decision_seconds'] for game in games)
+        results.append({
+            'grid_size': grid_size,
+            'games': seeds,
+            'avg_score': sum(game['score'] for game in games) / seeds,
+            'deaths': sum(game['died'] for game in games),
+            'wins': sum(game['won'] for game in games),
+            'completion_rate': sum(game['won'] for game in games) / seeds,
+            'moves_per_second': moves / seconds if seconds else 0.0,
+            'max_decision_ms': max(game['max_decision_seconds'] for game in games) * 1000
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the snake autopilot")
+    parser.add_argument("--grid-sizes", type=int, nargs="+", default=[10, 20, 30])
+    parser.add_argument("--seeds", type=int, default=20)
+    parser.add_argument("--cycle-grid-size", type=int, default=30)
+    args = parser.parse_args()
+
+    print(f"{'grid':>5} {'games':>6} {'avg score':>10} {'deaths':>7} {'wins':>5} {'completed':>10} {'moves/s':>10} "
+          f"{'max ms':>8}")
+    for result in benchmark(args.grid_sizes, args.seeds, args.cycle_grid_size):
+        print(f"{result['grid_size']:>5} {result['games']:>6} {result['avg_score']:>10.1f} {result['deaths']:>7} "
+              f"{result['wins']:>5} {result['completion_rate']:>10.0%} {result['moves_per_second']:>10,.0f} "
+              f"{result['max_decision_ms']:>8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Board element for task1.py that the browser keeps between runs.
+
+Each run sends a numbered frame holding either every cell (row-major) or
+only the (x, y, value) cells changed since the previous frame, which the
+browser patches in place. A browser that missed a frame, e.g. because the
+element was remounted, asks for every cell through the 'resync' trigger and
+the next frame carries the full board.
+
+Text boards show each value (an emoji) in a grid of spans; color boards
+paint each value (a CSS color) onto a canvas.
+"""
+from functools import partial
+from typing import Iterable, Optional, Sequence, Tuple
+
+import streamlit as st
+
+BOARD_CSS = """
+.board { display: inline-grid; line-height: 1.1; }
+.board span { text-align: center; }
+.board canvas { display: block; image-rendering: pixelated; }
+"""
+
+BOARD_JS = """
+function textBoard(board, size, cellSize) {
+  board.style.fontSize = `${cellSize}px`;
+  board.style.gridTemplateColumns = `repeat(${size}, 1.2em)`;
+  const spans = Array.from({ length: size * size }, () => document.createElement("span"));
+  board.replaceChildren(...spans);
+  return { set: (x, y, value) => { spans[y * size + x].textContent = value; } };
+}
+
+function colorBoard(board, size, cellSize) {
+  const canvas = document.createElement("canvas");
+  canvas.width = canvas.height = size * cellSize;
+  board.style.gridTemplateColumns = "";
+  board.replaceChildren(canvas);
+  const context = canvas.getContext("2d");
+  return {
+    set: (x, y, value) => {
+      context.fillStyle = value;
+      context.fillRect(x * cellSize, y * cellSize, cellSize, cellSize);
+    }
+  };
+}
+
+export default function ({ data, parentElement, setTriggerValue }) {
+  let board = parentElement.querySelector(".board");
+  if (!board) {
+    board = document.createElement("div");
+    board.className = "board";
+    parentElement.appendChild(board);
+  }
+  const { kind, size, cell_size: cellSize, frame, base, cells, changes } = data;
+  let state = board.boardState;
+  if (cells) {
+    state = kind === "color" ? colorBoard(board, size, cellSize) : textBoard(board, size, cellSize);
+    Object.assign(state, { kind, size });
+    cells.forEach((value, i) => state.set(i % size, Math.floor(i / size), value));
+    board.boardState = state;
+  } else if (!state || state.frame !== base || state.kind !== kind || state.size !== size) {
+    setTriggerValue("resync", frame);
+    return;
+  } else {
+    for (const [x, y, value] of changes) {
+      state.set(x, y, value);
+    }
+  }
+  state.frame = frame;
+}
+"""
+
+_board = st.components.v2.component("snake_board", css=BOARD_CSS, js=BOARD_JS)
+
+Change = Tuple[int, int, str]
+
+def _request_full_board(key: str):
+    st.session_state[f"{key}_resync"] = True
+
+def needs_full_board(key: str) -> bool:
+    """Whether the next frame of the board must carry every cell"""
+    return f"{key}_frame" not in st.session_state or st.session_state.get(f"{key}_resync", False)
+
+def show_board(key: str, size: int, cells: Optional[Sequence[str]] = None, changes: Iterable[Change] = (),
+               kind: str = "text", cell_size: int = 16):
+    """Send the next frame of the board: every cell, or the cells changed since the previous frame"""
+    frame = st.session_state.get(f"{key}_frame", -1) + 1
+    st.session_state[f"{key}_frame"] = frame
+    st.session_state[f"{key}_resync"] = False
+    data = {'kind': kind, 'size': size, 'cell_size': cell_size, 'frame': frame}
+    if cells is not None:
+        data['cells'] = list(cells)
+    else:
+        data['base'] = frame - 1
+        data['changes'] = [list(change) for change in changes]
+    _board(key=key, data=data, on_resync_change=partial(_request_full_board, key))
@@ -0,0 +1,190 @@
+"""Headless snake environments for agents, with a gym-style API.
+
+SnakeEnv wraps a single SnakeGame. VectorSnakeEnv steps many independent
+games at once with NumPy. Its boards hold, for every body cell, the number of
+ticks until that cell is vacated (the tail is 1 and the head is the
+snake's length). One move is then a batched decrement plus writing the new
+head, so collisions, food and scoring never loop over snakes or cells.
+
+Both follow the gymnasium conventions without depending on it:
+    obs, info = env.reset(seed=0)
+    obs, reward, terminated, truncated, info = env.step(action)
+
+Actions are indexes into ACTIONS. Observations are int8 boards with the
+codes EMPTY, BODY, HEAD and FOOD. Rewards are +1 for eating and -1 for dying.
+
+Example:
+    python snake_env.py --envs 4096 --grid-size 10 --steps 2000
+"""
+import argparse
+import time
+from typing import Optional
+
+import numpy as np
+
+from snake_game import DIRECTIONS, OPPOSITE, SnakeGame
+
+ACTIONS = list(DIRECTIONS)
+ACTION_DELTAS = np.array([DIRECTIONS[action] for action in ACTIONS], dtype=np.int64)
+OPPOSITE_ACTION = np.array([ACTIONS.index(OPPOSITE[action]) for action in ACTIONS], dtype=np.int64)
+START_ACTION = ACTIONS.index("RIGHT")
+
+EMPTY, BODY, HEAD, FOOD = 0, 1, 2, 3
+
+class SnakeEnv:
+    """Single headless game with reset/step"""
+
+    def __init__(self, grid_size: int = 10, max_steps: Optional[int] = None, seed: Optional[int] = None):
+        self.game = SnakeGame(grid_size, seed=seed)
+        self.max_steps = max_steps
+        self.steps = 0
+
+    def observation(self) -> np.ndarray:
+        board = np.zeros((self.game.grid_size, self.game.grid_size), dtype=np.int8)
+        if self.game.snake:
+            xs, ys = zip(*self.game.snake)
+            board[list(ys), list(xs)] = BODY
+            board[ys[0], xs[0]] = HEAD
+        if self.game.food is not None:
+            board[self.game.food[1], self.game.food[0]] = FOOD
+        return board
+
+    def reset(self, seed: Optional[int] = None):
+        if seed is not None:
+            self.game.rng.seed(seed)
+        self.game.reset()
+        self.steps = 0
+        return self.observation(), {'score': 0}
+
+    def step(self, action: int):
+        self.game.turn(ACTIONS[action])
+        ate = self.game.step()
+        self.steps += 1
+        terminated = self.game.game_over
+        reward = 1.0 if ate else (-1.0 if terminated else 0.0)
+        truncated = not terminated and self.max_steps is not None and self.steps >= self.max_steps
+        return self.observation(), reward, terminated, truncated, {'score': self.game.score}
+
+class VectorSnakeEnv:
+    """Many independent games stepped together in NumPy arrays.
+
+    Finished games are reset automatically, as in gymnasium vector envs. The
+    step info holds the final score of every game that ended on that step
+    (-1 for games that are still running).
+    """
+
+    def __init__(self, num_envs: int, grid_size: int = 10, max_steps: Optional[int] = None,
+                 seed: Optional[int] = None):
+        self.num_envs = num_envs
+        self.grid_size = grid_size
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng(seed)
+        self.env_index = np.arange(num_envs)
+        self.body = np.zeros((num_envs, grid_size, grid_size), dtype=np.int32)
+        self.heads = np.zeros((num_envs, 2), dtype=np.int64)
+        self.food = np.zeros((num_envs, 2), dtype=np.int64)
+        self.directions = np.full(num_envs, START_ACTION, dtype=np.int64)
+        self.lengths = np.ones(num_envs, dtype=np.int32)
+        self.scores = np.zeros(num_envs, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.reset_envs(self.env_index)
+
+    def reset(self, seed: Optional[int] = None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self.reset_envs(self.env_index)
+        return self.observation(), {'score': self.scores.copy()}
+
+    def reset_envs(self, envs: np.ndarray):
+        """Restart the given games with a one-cell snake in the middle"""
+        center = self.grid_size // 2
+        self.body[envs] = 0
+        self.body[envs, center, center] = 1
+        self.heads[envs] = center
+        self.directions[envs] = START_ACTION
+        self.lengths[envs] = 1
+        self.scores[envs] = 0
+        self.steps[envs] = 0
+        self.spawn_food(envs)
+
+    def spawn_food(self, envs: np.ndarray) -> np.ndarray:
+        """Place food on a random empty cell of each game. Returns which boards were full."""
+        if len(envs) == 0:
+            return np.zeros(0, dtype=bool)
+        empty = self.body[envs].reshape(len(envs), -1) == 0
+        # Random keys on empty cells only; the argmax is a uniform pick among them
+        keys = np.where(empty, self.rng.random(empty.shape), -1.0)
+        cells = keys.argmax(axis=1)
+        self.food[envs, 0] = cells % self.grid_size
+        self.food[envs, 1] = cells // self.grid_size
+        return ~empty.any(axis=1)
+
+    def observation(self) -> np.ndarray:
+        board = (self.body > 0).astype(np.int8)
+        board[self.env_index, self.heads[:, 1], self.heads[:, 0]] = HEAD
+        board[self.env_index, self.food[:, 1], self.food[:, 0]] = FOOD
+        return board
+
+    def step(self, actions):
+        actions = np.asarray(actions, dtype=np.int64)
+        # Reversing onto the body is ignored, like SnakeGame.turn
+        self.directions = np.where(actions == OPPOSITE_ACTION[self.directions], self.directions, actions)
+        new_heads = self.heads + ACTION_DELTAS[self.directions]
+
+        outside = ((new_heads < 0) | (new_heads >= self.grid_size)).any(axis=1)
+        x = np.clip(new_heads[:, 0], 0, self.grid_size - 1)
+        y = np.clip(new_heads[:, 1], 0, self.grid_size - 1)
+        dead = outside | (self.body[self.env_index, y, x] > 0)
+        alive = ~dead
+        ate = alive & (new_heads == self.food).all(axis=1)
+
+        # Every segment of a snake that moved without eating gets one tick older
+        moved = alive & ~ate
+        self.body -= (self.body > 0) & moved[:, None, None]
+        self.lengths += ate
+        self.body[self.env_index[alive], y[alive], x[alive]] = self.lengths[alive]
+        self.heads[alive] = new_heads[alive]
+        self.scores += ate
+        self.steps += 1
+
+        won = np.zeros(self.num_envs, dtype=bool)
+        won[ate] = self.spawn_food(self.env_index[ate])
+
+        rewards = ate.astype(np.float32) - dead
+        terminated = dead | won
+        truncated = ~terminated & (self.steps >= self.max_steps) if self.max_steps else np.zeros_like(terminated)
+        done = terminated | truncated
+        final_scores = np.where(done, self.scores, -1)
+        if done.any():
+            self.reset_envs(self.env_index[done])
+        return self.observation(), rewards, terminated, truncated, {'final_score': final_scores}
+
+def benchmark(num_envs: int, grid_size: int, steps: int, seed: int = 0) -> dict:
+    """Random-policy throughput of VectorSnakeEnv"""
+    env = VectorSnakeEnv(num_envs, grid_size, seed=seed)
+    env.reset(seed=seed)
+    rng = np.random.default_rng(seed)
+    actions = rng.integers(0, len(ACTIONS), (steps, num_envs))
+    episodes = 0
+    start = time.perf_counter()
+    for step in range(steps):
+        _, _, terminated, truncated, _ = env.step(actions[step])
+        episodes += int((terminated | truncated).sum())
+    elapsed = time.perf_counter() - start
+    return {'env_steps': num_envs * steps, 'seconds': elapsed,
+            'steps_per_second': num_envs * steps / elapsed, 'episodes': episodes}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized snake environment")
+    parser.add_argument("--envs", type=int, default=4096)
+    parser.add_argument("--grid-size", type=int, default=10)
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    result = benchmark(args.envs, args.grid_size, args.steps, args.seed)
+    print(f"{result['env_steps']:,} env steps in {result['seconds']:.2f}s "
+          f"({result['steps_per_second']:,.0f} steps/s, {result['episodes']:,} episodes finished)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import random
+from collections import deque
+from typing import Optional, Tuple
+
+DIRECTIONS = {
+    "UP": (0, -1),
+    "DOWN": (0, 1),
+    "LEFT": (-1, 0),
+    "RIGHT": (1, 0)
+}
+
+OPPOSITE = {"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT", "RIGHT": "LEFT"}
+
+class FreeCells:
+    """Set of empty cells with O(1) add, remove and uniform random sampling"""
+
+    def __init__(self, cells):
+        self.cells = list(cells)
+        self.index = {cell: i for i, cell in enumerate(self.cells)}
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __contains__(self, cell):
+        return cell in self.index
+
+    def add(self, cell):
+        if cell not in self.index:
+            self.index[cell] = len(self.cells)
+            self.cells.append(cell)
+
+    def remove(self, cell):
+        # Swap the last cell into the removed slot so the list stays dense
+        i = self.index.pop(cell)
+        last = self.cells.pop()
+        if i < len(self.cells):
+            self.cells[i] = last
+            self.index[last] = i
+
+    def sample(self, rng: random.Random):
+        return self.cells[rng.randrange(len(self.cells))]
+
+class SnakeGame:
+    """Snake on a square grid with constant-time steps and food spawns.
+
+    The body is a deque (head first), mirrored by an occupancy set for
+    collision checks and a FreeCells index of empty cells for food placement.
+    Cells changed by each step are collected in `dirty` so views can redraw
+    only those; `full_redraw` is set when the whole board changed.
+    """
+
+    def __init__(self, grid_size: int = 10, seed: Optional[int] = None):
+        self.grid_size = grid_size
+        self.rng = random.Random(seed)
+        self.reset()
+
+    def reset(self):
+        """Start a new game with a one-cell snake in the middle"""
+        start = (self.grid_size // 2, self.grid_size // 2)
+        self.snake = deque([start])
+        self.occupied = {start}
+        self.free = FreeCells((x, y) for y in range(self.grid_size) for x in range(self.grid_size))
+        self.free.remove(start)
+        self.direction = "RIGHT"
+        self.last_move = self.direction
+        self.score = 0
+        self.game_over = False
+        self.food = None
+        self.dirty = set()
+        self.full_redraw = True
+        self.spawn_food()
+
+    @property
+    def head(self) -> Tuple[int, int]:
+        return self.snake[0]
+
+    def spawn_food(self):
+        """Place food on a random empty cell; a full board ends the game"""
+        if len(self.free) == 0:
+            self.food = None
+            self.game_over = True
+        else:
+            self.food = self.free.sample(self.rng)
+            self.dirty.add(self.food)
+
+    def turn(self, direction: str):
+        """Change direction unless it would reverse the snake onto itself"""
+        # Compare with the last move made, so two quick turns within one tick can't reverse
+        if direction in DIRECTIONS and direction != OPPOSITE[self.last_move]:
+            self.direction = direction
+
+    def next_head(self, direction: Optional[str] = None) -> Tuple[int, int]:
+        dx, dy = DIRECTIONS[direction or self.direction]
+        head_x, head_y = self.snake[0]
+        return (head_x + dx, head_y + dy)
+
+    def is_collision(self, cell: Tuple[int, int]) -> bool:
+        x, y = cell
+        return not (0 <= x < self.grid_size and 0 <= y < self.grid_size) or cell in self.occupied
+
+    def step(self) -> bool:
+        """Move one cell. Returns True if food was eaten."""
+        if self.game_over:
+            return False
+
+        new_head = self.next_head()
+        self.last_move = self.direction
+        if self.is_collision(new_head):
+            self.game_over = True
+            return False
+
+        self.snake.appendleft(new_head)
+        self.occupied.add(new_head)
+        self.free.remove(new_head)
+        # The old head turns into body, so it is redrawn as well
+        self.dirty.update((new_head, self.snake[1]))
+
+        if new_head == self.food:
+            self.score += 1
+            self.spawn_food()
+            return True
+
+        tail = self.snake.pop()
+        self.occupied.remove(tail)
+        self.free.add(tail)
+        self.dirty.add(tail)
+        return False
+
+    def cell(self, cell: Tuple[int, int]) -> str:
+        """What occupies a cell: 'head', 'body', 'food' or 'empty'"""
+        if cell == self.snake[0]:
+            return "head"
+        if cell in self.occupied:
+            return "body"
+        if cell == self.food:
+            return "food"
+        return "empty"
+
+    def take_changes(self):
+        """Cells changed since the last call, or None if the whole board must be redrawn"""
+        changed = None if self.full_redraw else self.dirty
+        self.dirty = set()
+        self.full_redraw = False
+        return changed
+
+    def to_snapshot(self) -> dict:
+        """Game state as JSON-serializable data; free cells are derived from the body"""
+        return {
+            'grid_size': self.grid_size,
+            'snake': [list(cell) for cell in self.snake],
+            'direction': self.direction,
+            'last_move': self.last_move,
+            'score': self.score,
+            'game_over': self.game_over,
+            'food': list(self.food) if self.food is not None else None
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> 'SnakeGame':
+        game = cls(snapshot['grid_size'])
+        game.snake = deque(tuple(cell) for cell in snapshot['snake'])
+        game.occupied = set(game.snake)
+        game.free = FreeCells((x, y) for y in range(game.grid_size) for x in range(game.grid_size)
+                              if (x, y) not in game.occupied)
+        game.direction = snapshot['direction']
+        game.last_move = snapshot['last_move']
+        game.score = snapshot['score']
+        game.game_over = snapshot['game_over']
+        game.food = tuple(snapshot['food']) if snapshot['food'] is not None else None
+        game.dirty = set()
+        game.full_redraw = True
+        return game
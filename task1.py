@@ -1,103 +1,210 @@
-import streamlit as st
-import random
-
-# Game settings
-GRID_SIZE = 10
-
-# Initialize session state
-if "snake" not in st.session_state:
-    st.session_state.snake = [(5, 5)]
-    st.session_state.direction = "RIGHT"
-    st.session_state.food = (random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1))
-    st.session_state.score = 0
-    st.session_state.game_over = False
-
-def move_snake():
-    if st.session_state.game_over:
-        return
-
-    head_x, head_y = st.session_state.snake[0]
-    direction = st.session_state.direction
-
-    if direction == "UP":
-        new_head = (head_x, head_y - 1)
-    elif direction == "DOWN":
-        new_head = (head_x, head_y + 1)
-    elif direction == "LEFT":
-        new_head = (head_x - 1, head_y)
-    elif direction == "RIGHT":
-        new_head = (head_x + 1, head_y)
-    else:
-        new_head = (head_x, head_y)
-
-    # Check for collisions
-    if (
-        new_head[0] < 0 or new_head[0] >= GRID_SIZE or
-        new_head[1] < 0 or new_head[1] >= GRID_SIZE or
-        new_head in st.session_state.snake
-    ):
-        st.session_state.game_over = True
-        return
-
-    st.session_state.snake = [new_head] + st.session_state.snake
-
-    # Check for food
-    if new_head == st.session_state.food:
-        st.session_state.score += 1
-        while True:
-            new_food = (random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1))
-            if new_food not in st.session_state.snake:
-                st.session_state.food = new_food
-                break
-    else:
-        st.session_state.snake.pop()
-
-def reset_game():
-    st.session_state.snake = [(5, 5)]
-    st.session_state.direction = "RIGHT"
-    st.session_state.food = (random.randint(0, GRID_SIZE-1), random.randint(0, GRID_SIZE-1))
-    st.session_state.score = 0
-    st.session_state.game_over = False
-
-st.title("🐍 Snake Game (Step-based)")
-
-st.write(f"Score: {st.session_state.score}")
-
-# Game controls
-col1, col2, col3 = st.columns(3)
-with col2:
-    if st.button("⬆️ Up"):
-        if st.session_state.direction != "DOWN":
-            st.session_state.direction = "UP"
-with col1:
-    if st.button("⬅️ Left"):
-        if st.session_state.direction != "RIGHT":
-            st.session_state.direction = "LEFT"
-with col3:
-    if st.button("➡️ Right"):
-        if st.session_state.direction != "LEFT":
-            st.session_state.direction = "RIGHT"
-with col2:
-    if st.button("⬇️ Down"):
-        if st.session_state.direction != "UP":
-            st.session_state.direction = "DOWN"
-
-if st.button("Next Step"):
-    move_snake()
-
-if st.button("Restart Game"):
-    reset_game()
-
-# Draw the grid
-grid = [["⬜" for _ in range(GRID_SIZE)] for _ in range(GRID_SIZE)]
-for x, y in st.session_state.snake:
-    grid[y][x] = "🟩"
-fx, fy = st.session_state.food
-grid[fy][fx] = "🍎"
-
-st.write("Game Board:")
-for row in grid:
-    st.write("".join(row))
-
-if st.session_state.game_over:
-    st.error("Game Over! Click 'Restart Game' to play again.")
+import time
+
+import streamlit as st
+
+from app_resources import get_arena, get_session_registry
+from snake_arena import EMPTY, FOOD
+from snake_autopilot import Autopilot
+from snake_board import needs_full_board, show_board
+from snake_game import SnakeGame
+
+# Game settings
+GRID_SIZE = 10
+GRID_SIZES = [10, 20, 30, 40]
+CELL_EMOJI = {"head": "🟢", "body": "🟩", "food": "🍎", "empty": "⬜"}
+
+# Shared arena settings
+ARENA_SIZE = 64
+ARENA_BOTS = 20
+ARENA_CELL_PIXELS = 8
+ARENA_EMPTY_COLOR = "#f0f0f0"
+ARENA_FOOD_COLOR = "#d73027"
+ARENA_PLAYER_COLOR = "#1a9850"
+ARENA_PALETTE = ["#313695", "#74add1", "#f46d43", "#fdae61", "#8064a2", "#666666", "#bf812d", "#35978f"]
+# The leaderboard changes far less often than the board
+LEADERBOARD_SECONDS = 2.0
+
+# Idle sessions are evicted to disk; the game is restored here on the next run
+sessions = get_session_registry()
+sessions.register_codec("snake_game", SnakeGame.to_snapshot, SnakeGame.from_snapshot)
+sessions.track("task1.py")
+
+# Initialize session state
+if "snake_game" not in st.session_state:
+    st.session_state.snake_game = SnakeGame(GRID_SIZE)
+    st.session_state.autopilot = Autopilot()
+    st.session_state.running = False
+    st.session_state.last_tick = 0.0
+
+# Fragments and callbacks outlive this run, so they reach the game through a
+# late-bound handle rather than keeping it in memory once it is evicted
+game = sessions.value("snake_game", "task1.py")
+
+def move_snake():
+    game.step()
+
+def reset_game():
+    game.reset()
+    st.session_state.running = False
+
+def toggle_running():
+    st.session_state.running = not st.session_state.running
+    st.session_state.last_tick = time.monotonic()
+
+def change_grid_size():
+    st.session_state.snake_game = SnakeGame(st.session_state.grid_size)
+    st.session_state.running = False
+
+def arena_color(value, snake_id):
+    """Color of an arena cell code, with the session's own snake highlighted"""
+    if value == EMPTY:
+        return ARENA_EMPTY_COLOR
+    if value == FOOD:
+        return ARENA_FOOD_COLOR
+    if value == snake_id:
+        return ARENA_PLAYER_COLOR
+    return ARENA_PALETTE[value % len(ARENA_PALETTE)]
+
+def draw_arena(arena, snake_id):
+    """Send the cells changed since this session's last frame to the board in the browser"""
+    since = -1 if needs_full_board("arena_board") else st.session_state.get("arena_tick", -1)
+    tick, grid, changes = arena.updates(since, snake_id)
+    st.session_state.arena_tick = tick
+    if grid is not None:
+        show_board("arena_board", arena.grid_size, kind="color", cell_size=ARENA_CELL_PIXELS,
+                   cells=[arena_color(value, snake_id) for value in grid.ravel().tolist()])
+    else:
+        # Keep only the latest value per cell; changes are in tick order
+        latest = {(x, y): value for x, y, value in changes}
+        show_board("arena_board", arena.grid_size, kind="color", cell_size=ARENA_CELL_PIXELS,
+                   changes=[(x, y, arena_color(value, snake_id)) for (x, y), value in latest.items()])
+
+def join_arena():
+    arena = get_arena(ARENA_SIZE, ARENA_BOTS)
+    name = st.session_state.get("arena_name") or "player"
+    st.session_state.arena_snake_id = arena.join(name)
+    st.session_state.arena_tick = -1
+
+def leave_arena():
+    get_arena(ARENA_SIZE, ARENA_BOTS).leave(st.session_state.pop("arena_snake_id"))
+
+def render_arena():
+    arena = get_arena(ARENA_SIZE, ARENA_BOTS)
+
+    @st.fragment(run_every=1 / arena.tick_rate)
+    def arena_area():
+        """Arena board and controls, refreshed every arena tick"""
+        sessions.track("task1.py")
+        snake_id = st.session_state.get("arena_snake_id")
+        info = arena.snake_info(snake_id) if snake_id is not None else None
+        if snake_id is not None and info is None:
+            # Dropped for being idle
+            del st.session_state.arena_snake_id
+            snake_id = None
+
+        if snake_id is None:
+            st.text_input("Name", key="arena_name")
+            st.button("Join arena", on_click=join_arena)
+        else:
+            st.write(f"Score: {info['score']} (best {info['best_score']})")
+            col1, col2, col3 = st.columns(3)
+            with col2:
+                st.button("⬆️ Up", shortcut="ArrowUp", on_click=arena.turn, args=(snake_id, "UP"))
+            with col1:
+                st.button("⬅️ Left", shortcut="ArrowLeft", on_click=arena.turn, args=(snake_id, "LEFT"))
+            with col3:
+                st.button("➡️ Right", shortcut="ArrowRight", on_click=arena.turn, args=(snake_id, "RIGHT"))
+            with col2:
+                st.button("⬇️ Down", shortcut="ArrowDown", on_click=arena.turn, args=(snake_id, "DOWN"))
+            if not info['alive']:
+                st.error("You crashed!")
+                st.button("Respawn", on_click=arena.respawn, args=(snake_id,))
+            st.button("Leave arena", on_click=leave_arena)
+
+        draw_arena(arena, snake_id)
+        st.caption("Your snake is green, food is red")
+
+    @st.fragment(run_every=LEADERBOARD_SECONDS)
+    def leaderboard_area():
+        """Arena statistics and leaderboard, refreshed less often than the board"""
+        stats = arena.stats()
+        st.caption(f"Tick {stats['tick']}: {stats['alive']} of {stats['snakes']} snakes alive, "
+                   f"tick time p99 {stats['tick_p99_ms']:.1f} ms")
+        st.dataframe(arena.leaderboard(), hide_index=True)
+
+    arena_area()
+    leaderboard_area()
+
+def draw_board():
+    """Send the cells the game reports as changed to the board in the browser"""
+    font_size = max(8, 24 - game.grid_size // 3)
+    size = game.grid_size
+    changed = game.take_changes()
+    if changed is None or needs_full_board("snake_board"):
+        show_board("snake_board", size, cell_size=font_size,
+                   cells=[CELL_EMOJI[game.cell((x, y))] for y in range(size) for x in range(size)])
+    else:
+        show_board("snake_board", size, cell_size=font_size,
+                   changes=[(x, y, CELL_EMOJI[game.cell((x, y))]) for x, y in changed])
+
+st.title("🐍 Snake Game")
+
+mode = st.radio("Mode", ["Step-based", "Real-time", "Autopilot", "Arena"], horizontal=True, key="snake_mode")
+if mode == "Arena":
+    render_arena()
+    st.stop()
+
+st.selectbox("Grid size", GRID_SIZES, key="grid_size", on_change=change_grid_size)
+real_time = mode in ("Real-time", "Autopilot")
+autopilot = mode == "Autopilot"
+if real_time:
+    tick_rate = st.slider("Ticks per second", 1, 30, 10, key="tick_rate")
+
+# Starting, pausing and restarting rerun the whole app so the fragment timer is updated
+col1, col2 = st.columns(2)
+with col1:
+    if real_time:
+        st.button("⏸️ Pause" if st.session_state.running else "▶️ Start", shortcut="Space",
+                  on_click=toggle_running)
+with col2:
+    st.button("Restart Game", on_click=reset_game)
+
+@st.fragment(run_every=1 / tick_rate if real_time and st.session_state.running else None)
+def play_area():
+    """Controls and board; in real-time mode this reruns on its own every tick"""
+    sessions.track("task1.py")
+    if real_time and st.session_state.running and not game.game_over:
+        # Button presses also rerun the fragment, so only step when a tick is due
+        now = time.monotonic()
+        if now - st.session_state.last_tick >= 0.9 / tick_rate:
+            st.session_state.last_tick = now
+            if autopilot:
+                game.turn(st.session_state.autopilot.choose(game))
+            game.step()
+
+    st.write(f"Score: {game.score}")
+
+    # Game controls (arrow keys work as shortcuts)
+    col1, col2, col3 = st.columns(3)
+    with col2:
+        st.button("⬆️ Up", shortcut="ArrowUp", on_click=game.turn, args=("UP",))
+    with col1:
+        st.button("⬅️ Left", shortcut="ArrowLeft", on_click=game.turn, args=("LEFT",))
+    with col3:
+        st.button("➡️ Right", shortcut="ArrowRight", on_click=game.turn, args=("RIGHT",))
+    with col2:
+        st.button("⬇️ Down", shortcut="ArrowDown", on_click=game.turn, args=("DOWN",))
+
+    if not real_time:
+        st.button("Next Step", on_click=move_snake)
+
+    draw_board()
+
+    if game.game_over:
+        st.error("Game Over! Click 'Restart Game' to play again.")
+        if st.session_state.running:
+            # Full rerun so the fragment stops ticking
+            st.session_state.running = False
+            st.rerun()
+
+play_area()
@@ -1,48 +1,189 @@
-import streamlit as st
-import numpy as np
-import pandas as pd
-from sklearn.datasets import fetch_california_housing
-from sklearn.model_selection import train_test_split
-from sklearn.linear_model import LinearRegression
-import pickle
-import os
-
-MODEL_PATH = 'house_price_model.pkl'
-
-def train_and_save_model():
-    data = fetch_california_housing(as_frame=True)
-    df = data.frame
-    X = df.drop('MedHouseVal', axis=1)
-    y = df['MedHouseVal']
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    model = LinearRegression()
-    model.fit(X_train, y_train)
-    with open(MODEL_PATH, 'wb') as f:
-        pickle.dump(model, f)
-
-def load_model():
-    if not os.path.exists(MODEL_PATH):
-        train_and_save_model()
-    with open(MODEL_PATH, 'rb') as f:
-        model = pickle.load(f)
-    return model
-
-# Streamlit frontend
-st.title("California House Price Prediction")
-
-st.write("Enter the following features to predict the median house value:")
-
-MedInc = st.number_input('Median Income (10k USD)', min_value=0.0, max_value=20.0, value=3.0)
-HouseAge = st.number_input('House Age', min_value=1, max_value=100, value=20)
-AveRooms = st.number_input('Average Rooms', min_value=1.0, max_value=20.0, value=5.0)
-AveBedrms = st.number_input('Average Bedrooms', min_value=1.0, max_value=10.0, value=1.0)
-Population = st.number_input('Population', min_value=1, max_value=10000, value=1000)
-AveOccup = st.number_input('Average Occupancy', min_value=1.0, max_value=10.0, value=3.0)
-Latitude = st.number_input('Latitude', min_value=32.0, max_value=42.0, value=34.0)
-Longitude = st.number_input('Longitude', min_value=-124.0, max_value=-114.0, value=-120.0)
-
-if st.button('Predict'):
-    model = load_model()
-    features = np.array([[MedInc, HouseAge, AveRooms, AveBedrms, Population, AveOccup, Latitude, Longitude]])
-    prediction = model.predict(features)[0]
-    st.success(f"Predicted Median House Value: ${prediction * 100000:.2f}")
\ No newline at end of file
+import streamlit as st
+import numpy as np
+import os
+import pathlib
+import tempfile
+import time
+
+render_start = time.perf_counter()
+
+from app_resources import get_model_registry, get_monitor, get_prediction_cache, get_session_registry, get_tile_pyramid
+from house_price_model import FEATURE_NAMES
+from house_price_metrics import METRICS_PATH
+
+def cached_predict(features):
+    """Predict through the shared cache, warming it for each new model version"""
+    monitor = get_monitor()
+    with monitor.timed('load'):
+        model, version = get_model_registry().get()
+    cache = get_prediction_cache()
+    if cache.model_version != version:
+        cache.precompute(model, version)
+    with monitor.timed('predict'):
+        predictions = cache.predict(model, version, features)
+    monitor.record_predictions(version, features)
+    return predictions
+
+get_session_registry().track("task2.py")
+
+# Streamlit frontend
+st.title("California House Price Prediction")
+
+def feature_inputs():
+    """Render the eight feature inputs and return their values"""
+    MedInc = st.number_input('Median Income (10k USD)', min_value=0.0, max_value=20.0, value=3.0, key='MedInc')
+    HouseAge = st.number_input('House Age', min_value=1, max_value=100, value=20, key='HouseAge')
+    AveRooms = st.number_input('Average Rooms', min_value=1.0, max_value=20.0, value=5.0, key='AveRooms')
+    AveBedrms = st.number_input('Average Bedrooms', min_value=1.0, max_value=10.0, value=1.0, key='AveBedrms')
+    Population = st.number_input('Population', min_value=1, max_value=10000, value=1000, key='Population')
+    AveOccup = st.number_input('Average Occupancy', min_value=1.0, max_value=10.0, value=3.0, key='AveOccup')
+    Latitude = st.number_input('Latitude', min_value=32.0, max_value=42.0, value=34.0, key='Latitude')
+    Longitude = st.number_input('Longitude', min_value=-124.0, max_value=-114.0, value=-120.0, key='Longitude')
+    return [MedInc, HouseAge, AveRooms, AveBedrms, Population, AveOccup, Latitude, Longitude]
+
+mode = st.radio("Mode", ["Single house", "What-if", "Map", "Batch file", "Monitoring"], horizontal=True)
+
+if mode == "Single house":
+    st.write("Enter the following features to predict the median house value:")
+
+    inputs = feature_inputs()
+
+    if st.button('Predict'):
+        features = np.array([inputs])
+        prediction = cached_predict(features)[0]
+        st.success(f"Predicted Median House Value: ${prediction * 100000:.2f}")
+        stats = get_prediction_cache().stats()
+        st.caption(f"Prediction cache: {stats['hit_rate']:.0%} hit rate over {stats['hits'] + stats['misses']} lookups")
+
+elif mode == "What-if":
+    from house_price_sensitivity import contributions, sweep
+
+    st.write("See how the predicted value responds when one or two features change.")
+
+    with st.expander("Current input", expanded=False):
+        inputs = feature_inputs()
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        feature_x = st.selectbox("Sweep feature", FEATURE_NAMES, index=0)
+    with col2:
+        feature_y = st.selectbox("Against", ["(none)"] + [name for name in FEATURE_NAMES if name != feature_x])
+    with col3:
+        steps = st.slider("Grid steps", min_value=10, max_value=200, value=50)
+
+    model, _ = get_model_registry().get()
+    if feature_y == "(none)":
+        curve = sweep(model, inputs, feature_x, steps=steps)
+        curve['prediction'] *= 100000
+        st.line_chart(curve, x=feature_x, y='prediction')
+    else:
+        import altair as alt
+
+        grid = sweep(model, inputs, feature_x, feature_y, steps=steps)
+        grid['prediction'] *= 100000
+        heatmap = alt.Chart(grid).mark_rect().encode(
+            x=alt.X(f"{feature_x}:Q", bin=alt.Bin(maxbins=steps)),
+            y=alt.Y(f"{feature_y}:Q", bin=alt.Bin(maxbins=steps)),
+            color=alt.Color('prediction:Q', title='Value ($)'),
+            tooltip=[feature_x, feature_y, 'prediction']
+        )
+        st.altair_chart(heatmap)
+
+    st.markdown("#### Feature contributions")
+    st.caption("Change in predicted value ($) from resetting each feature to its default input")
+    st.bar_chart(contributions(model, inputs) * 100000)
+
+elif mode == "Map":
+    from house_price_tiles import MAX_ZOOM, colorize
+
+    st.write("Predicted value across California for a typical house (default inputs), precomputed per model version.")
+
+    _, version = get_model_registry().get()
+    with st.spinner("Building price tiles for this model..."):
+        pyramid = get_tile_pyramid(version)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        zoom = st.slider("Zoom", min_value=0, max_value=MAX_ZOOM, value=1)
+    with col2:
+        center_lat = st.slider("Center latitude", min_value=32.0, max_value=42.0, value=37.0, step=0.1)
+    with col3:
+        center_lon = st.slider("Center longitude", min_value=-124.0, max_value=-114.0, value=-120.0, step=0.1)
+
+    view, (lat_min, lat_max, lon_min, lon_max) = pyramid.viewport(zoom, center_lat, center_lon)
+    # Fixed color scale from the overview level so colors stay comparable while panning
+    low, high = np.percentile(pyramid.levels[0], [2, 98])
+    scale = max(1, 512 // view.shape[0])
+    image = np.repeat(np.repeat(colorize(view, low, high), scale, axis=0), scale, axis=1)
+    st.image(image, caption=f"Latitude {lat_min:.2f} to {lat_max:.2f}, longitude {lon_min:.2f} to {lon_max:.2f} "
+                            f"(blue ${low * 100000:,.0f}, red ${high * 100000:,.0f})")
+
+elif mode == "Batch file":
+    from house_price_batch import predict_file
+
+    st.write("Upload a CSV or Parquet file with the columns "
+             "MedInc, HouseAge, AveRooms, AveBedrms, Population, AveOccup, Latitude, Longitude. "
+             "Any other columns, such as ids, are passed through unchanged.")
+
+    uploaded = st.file_uploader("Feature file", type=["csv", "parquet"])
+    if uploaded is not None and st.button('Predict file'):
+        # The previous result's files go as soon as a new file is priced
+        previous = st.session_state.pop('batch_output', None)
+        if previous is not None:
+            previous['dir'].cleanup()
+
+        model, version = get_model_registry().get()
+        monitor = get_monitor()
+        # Removed by its finalizer once the session no longer holds it
+        output_dir = tempfile.TemporaryDirectory(prefix="house_prices_")
+        progress_bar = st.progress(0.0, text="Predicting...")
+
+        def show_progress(rows_read, progress):
+            progress_bar.progress(min(progress or 0.0, 1.0), text=f"Predicted {rows_read:,} rows")
+
+        try:
+            with monitor.timed('batch_file'):
+                rows_read, rows_predicted, paths = predict_file(
+                    model, uploaded, uploaded.name, output_dir.name, on_progress=show_progress,
+                    on_predict=lambda rows: monitor.record_predictions(version, rows))
+        except ValueError as e:
+            output_dir.cleanup()
+            st.error(f"Could not read the file: {e}")
+        else:
+            progress_bar.progress(1.0, text=f"Predicted {rows_read:,} rows")
+            st.session_state.batch_output = {'dir': output_dir, 'paths': paths, 'rows_read': rows_read,
+                                             'rows_predicted': rows_predicted}
+
+    batch_output = st.session_state.get('batch_output')
+    if batch_output is not None:
+        if batch_output['rows_predicted'] < batch_output['rows_read']:
+            st.warning(f"{batch_output['rows_read'] - batch_output['rows_predicted']:,} rows had missing or "
+                       "invalid values and were not priced; see the PredictionStatus column.")
+        paths = batch_output['paths']
+        for i, path in enumerate(paths, 1):
+            # Deferred, so a part is only read into memory when it is downloaded
+            label = "Download predictions" if len(paths) == 1 else f"Download predictions (part {i} of {len(paths)})"
+            st.download_button(label, pathlib.Path(path).read_bytes,
+                               file_name=os.path.basename(path), mime="application/gzip", on_click="ignore")
+
+elif mode == "Monitoring":
+    import pandas as pd
+
+    snapshot = get_monitor().snapshot()
+    st.write(f"Inputs seen since start: {snapshot['inputs_seen']:,}")
+
+    st.markdown("#### Latency")
+    if snapshot['latency']:
+        st.dataframe(pd.DataFrame(snapshot['latency']).T)
+    st.markdown("#### Predictions by model version")
+    st.write(snapshot['predictions_by_version'] or "No predictions yet")
+    st.markdown("#### Input drift against training data")
+    if snapshot['drift']:
+        st.dataframe(pd.DataFrame(snapshot['drift']).T)
+        st.caption("PSI above 0.1 suggests moderate drift, above 0.25 significant drift.")
+    else:
+        st.write("Not enough data to score drift yet.")
+
+monitor = get_monitor()
+monitor.observe_latency('render', time.perf_counter() - render_start)
+monitor.maybe_write_json(METRICS_PATH)
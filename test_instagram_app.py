@@ -0,0 +1,27 @@
+from instagram_app import RANK_TOP_K, InstagramApp
+
+def ranked_ids(app):
+    return [post["id"] for post in app.get_ranked_feed()]
+
+def test_unfollow_dropping_every_feed_member():
+    """Every top-K member losing score in one rescore used to pop the heap empty"""
+    app = InstagramApp()
+    app.users["bob"] = {"name": "Bob", "bio": "", "followers": 0, "following": 0, "posts": 0, "profile_pic": "🙂"}
+    app.current_user = "bob"
+    for i in range(RANK_TOP_K + 10):
+        app.create_post("📷", f"post {i}")
+    # The oldest posts are rescored first, so they are the ones to fill the feed
+    liked = [post["id"] for post in app.posts_by_author["bob"]][:RANK_TOP_K]
+    for user in range(900):
+        app.current_user = f"user_{user}"
+        for post_id in liked:
+            app.like_post(post_id)
+
+    app.current_user = "alice"
+    app.follow_user("bob")
+    assert set(ranked_ids(app)) == set(liked)
+    app.follow_user("bob")  # Unfollow
+    feed = ranked_ids(app)
+
+    app.compact()  # Drops the ranking state, so the next read rescores every post
+    assert feed == ranked_ids(app)